@@ -1,17 +1,71 @@
+from typing import Tuple, Union
+
 from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 
+from app.core.async_rate_limiter import AsyncSlidingWindowRateLimiter
+from app.core.config import RateLimit, settings
 from app.core.in_mem_rate_limiter import InMemoryRateLimiter
+from app.core.rate_limiter import AsyncRateLimiter, RateLimiter
+from app.core.redis_rate_limiter import RedisClient, RedisRateLimiter
+from app.core.shared_memory_rate_limiter import SharedMemoryRateLimiter
+from app.core.sliding_window_rate_limiter import SlidingWindowRateLimiter
 
 
-LIMIT = 5 # requests per window
-WINDOW = 30 # seconds
+def create_rate_limiter() -> Union[RateLimiter, AsyncRateLimiter]:
+    if settings.rate_limiter == "sliding_window":
+        return SlidingWindowRateLimiter(
+            shards=settings.rate_limiter_shards,
+            eviction_interval=settings.rate_limiter_eviction_interval,
+        )
+    if settings.rate_limiter == "in_memory":
+        return InMemoryRateLimiter()
+    if settings.rate_limiter == "shared_memory":
+        return SharedMemoryRateLimiter(
+            settings.rate_limiter_shared_memory_path,
+            slots=settings.rate_limiter_shared_memory_slots,
+        )
+    if settings.rate_limiter == "redis":
+        return RedisRateLimiter(RedisClient(settings.rate_limiter_redis_url))
+    return AsyncSlidingWindowRateLimiter()
 
-rate_limiter = InMemoryRateLimiter()
 
+rate_limiter = create_rate_limiter()
 
-async def rate_limit_dependency(request: Request):
-    key = request.client.host
-    allowed = rate_limiter.rate_limit(key, limit=LIMIT, window=WINDOW)
+
+def resolve_rate_limit(route_path: str, client_key: str) -> Tuple[str, RateLimit]:
+    """
+    Counter key and limit for a request: a per-client override wins over a
+    per-route one, which wins over the default. Routes with their own limit
+    count separately from the client's shared budget.
+    """
+    counter_key = client_key
+    rule = settings.rate_limit
+
+    route_rule = settings.rate_limit_routes.get(route_path)
+    if route_rule is not None:
+        counter_key = f"{route_path}:{client_key}"
+        rule = route_rule
+
+    return counter_key, settings.rate_limit_keys.get(client_key, rule)
+
+
+async def check_rate_limit(request: Request, cost: int = 1) -> None:
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", request.url.path)
+    key, rule = resolve_rate_limit(route_path, request.client.host)
+
+    # A request costlier than the whole budget still gets through on a fresh window
+    cost = min(cost, rule.limit)
+    if isinstance(rate_limiter, AsyncRateLimiter):
+        allowed = await rate_limiter.rate_limit(key, limit=rule.limit, window=rule.window, cost=cost)
+    elif rate_limiter.performs_io:
+        # File locks and sockets must not block the event loop
+        allowed = await run_in_threadpool(
+            rate_limiter.rate_limit, key, limit=rule.limit, window=rule.window, cost=cost,
+        )
+    else:
+        allowed = rate_limiter.rate_limit(key, limit=rule.limit, window=rule.window, cost=cost)
 
     if not allowed:
         raise HTTPException(
@@ -19,3 +73,6 @@ async def rate_limit_dependency(request: Request):
             detail="Too many requests"
         )
 
+
+async def rate_limit_dependency(request: Request):
+    await check_rate_limit(request)
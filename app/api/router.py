@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 
 from app.api.v1.employee import router as employee_router
+from app.api.v1.metrics import router as metrics_router
 
 api_router = APIRouter()
 api_router.include_router(employee_router, prefix="/employees", tags=["employee"])
-
+api_router.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
@@ -1,13 +1,36 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
-from app.core.database import get_session
-from app.schemas.employee import Employee, ListEmployeeFilters
-from app.schemas.pagination import PaginatedResponse
-from app.operations.employee import get_employees
+from app.core.config import settings
+from app.core.data_version import data_version
+from app.core.database import get_async_session, get_session
+from app.core.response_cache import response_cache
+from app.core.single_flight import async_listing_single_flight, listing_single_flight
+from app.core.typeahead_index import typeahead_index
+from app.schemas.employee import (
+    Employee,
+    EmployeeFacets,
+    EmployeeLookup,
+    EmployeeLookupResult,
+    EmployeeSuggestion,
+    ExportFormat,
+    ListEmployeeFilters,
+    SearchMode,
+    SortOrder,
+)
+from app.schemas.pagination import CountStrategy, PaginatedResponse
+from app.operations.cursor import InvalidCursorError
+from app.operations.cost import estimate_request_cost
+from app.operations.employee import EmployeePage, get_employee_page, get_employee_page_async
+from app.operations.export import export_employees
+from app.operations.facets import get_facets
+from app.operations.lookup import lookup_employees
+from app.operations.serialization import serialize_employee_page
 from app.models.employee import EmployeeStatus
-from app.api.deps.rate_limit_deps import rate_limit_dependency
+from app.api.deps.rate_limit_deps import check_rate_limit, rate_limit_dependency
 
 router = APIRouter()
 
@@ -16,37 +39,241 @@ def get_total_pages(total: int, page_size: int) -> int:
     return (total + page_size - 1) // page_size
 
 
-@router.get("", response_model=PaginatedResponse[Employee])
-def list_employees(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(10, ge=1, le=100),
+def get_employee_filters(
+    organisation_id: int | None = Query(None),
     statuses: List[EmployeeStatus] = Query(default=[], alias="statuses[]"),
     company_ids: List[int] = Query(default=[], alias="company_ids[]"),
     department_ids: List[int] = Query(default=[], alias="department_ids[]"),
     positions: List[str] = Query(default=[], alias="positions[]"),
     locations: List[str] = Query(default=[], alias="locations[]"),
     search: str | None = Query(None),
-    session: Session = Depends(get_session),
-    _: bool = Depends(rate_limit_dependency),
-):
-    filters = ListEmployeeFilters(
-        page=page,
-        page_size=page_size,
+    search_mode: SearchMode = Query(SearchMode.STANDARD, description="fuzzy also matches misspelled names, ranked by similarity"),
+) -> ListEmployeeFilters:
+    return ListEmployeeFilters(
+        organisation_id=organisation_id,
         statuses=statuses,
         company_ids=company_ids,
         department_ids=department_ids,
         positions=positions,
         locations=locations,
         search=search,
+        search_mode=search_mode,
     )
-    
-    total, employees = get_employees(session=session, filters=filters)
-
-    return {
-        "page": filters.page,
-        "page_size": filters.page_size,
-        "total": total,
-        "total_pages": get_total_pages(total, filters.page_size),
-        "data": employees,
+
+
+def get_listing_filters(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    sort: SortOrder | None = Query(None, description="Defaults to relevance with a search, id otherwise"),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    count: CountStrategy | None = Query(None, description="How to compute total; defaults to the server setting"),
+    filters: ListEmployeeFilters = Depends(get_employee_filters),
+) -> ListEmployeeFilters:
+    return filters.model_copy(update={
+        "page": page,
+        "page_size": page_size,
+        "sort": sort,
+        "cursor": cursor,
+        "count_strategy": count,
+    })
+
+
+async def listing_rate_limit(
+    request: Request,
+    filters: ListEmployeeFilters = Depends(get_listing_filters),
+    session: Session = Depends(get_session),
+):
+    if settings.response_cache_enabled and response_cache.has(filters.cache_key()):
+        # Served from the response cache: the database does no work
+        await check_rate_limit(request)
+        return
+    await check_rate_limit(request, cost=estimate_request_cost(filters, session))
+
+
+async def filters_rate_limit(
+    request: Request,
+    filters: ListEmployeeFilters = Depends(get_employee_filters),
+    session: Session = Depends(get_session),
+):
+    await check_rate_limit(request, cost=estimate_request_cost(filters, session))
+
+
+def get_cached_listing(filters: ListEmployeeFilters) -> Response | None:
+    if not settings.response_cache_enabled:
+        return None
+
+    body = response_cache.get(filters.cache_key())
+    if body is None:
+        return None
+    return Response(content=body, media_type="application/json")
+
+
+def build_listing_response(filters: ListEmployeeFilters, result: EmployeePage, version: int):
+    total_pages = get_total_pages(result.total, filters.page_size)
+
+    if settings.response_serializer == "fast":
+        body = serialize_employee_page(filters, result, total_pages)
+    else:
+        content = {
+            "page": filters.page,
+            "page_size": filters.page_size,
+            "total": result.total,
+            "total_is_estimate": result.total_is_estimate,
+            "total_pages": total_pages,
+            "data": result.employees,
+            "next_cursor": result.next_cursor,
+        }
+
+        if not settings.response_cache_enabled:
+            return content
+
+        body = PaginatedResponse[Employee].model_validate(content, from_attributes=True).model_dump_json(exclude_unset=True).encode()
+
+    if settings.response_cache_enabled:
+        response_cache.set(filters.cache_key(), body, version)
+    return Response(content=body, media_type="application/json")
+
+
+def list_employees(
+    filters: ListEmployeeFilters = Depends(get_listing_filters),
+    session: Session = Depends(get_session),
+    _: None = Depends(listing_rate_limit),
+):
+    cached = get_cached_listing(filters)
+    if cached is not None:
+        return cached
+    version = data_version.current
+
+    try:
+        if settings.single_flight_enabled:
+            result = listing_single_flight.do(
+                filters.cache_key(),
+                lambda: get_employee_page(session=session, filters=filters),
+            )
+        else:
+            result = get_employee_page(session=session, filters=filters)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return build_listing_response(filters, result, version)
+
+
+async def list_employees_async(
+    filters: ListEmployeeFilters = Depends(get_listing_filters),
+    session: AsyncSession = Depends(get_async_session),
+    _: None = Depends(listing_rate_limit),
+):
+    cached = get_cached_listing(filters)
+    if cached is not None:
+        return cached
+    version = data_version.current
+
+    try:
+        if settings.single_flight_enabled:
+            result = await async_listing_single_flight.do(
+                filters.cache_key(),
+                lambda: get_employee_page_async(session=session, filters=filters),
+            )
+        else:
+            result = await get_employee_page_async(session=session, filters=filters)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return build_listing_response(filters, result, version)
+
+
+# Sync handlers run in the threadpool; the async one stays on the event loop
+router.add_api_route(
+    "",
+    list_employees_async if settings.database_async else list_employees,
+    methods=["GET"],
+    response_model=PaginatedResponse[Employee],
+    # Columns an organisation doesn't display are left out, not sent as null
+    response_model_exclude_unset=True,
+)
+
+
+@router.get("/facets", response_model=EmployeeFacets)
+def list_employee_facets(
+    filters: ListEmployeeFilters = Depends(get_employee_filters),
+    session: Session = Depends(get_session),
+    _: None = Depends(filters_rate_limit),
+):
+    return get_facets(session=session, filters=filters)
+
+
+@router.get("/typeahead", response_model=List[EmployeeSuggestion])
+def suggest_employees(
+    q: str = Query(..., min_length=1, description="Prefix of a first name, last name, full name or email"),
+    limit: int = Query(10, ge=1, le=50),
+    session: Session = Depends(get_session),
+    _: bool = Depends(rate_limit_dependency),
+):
+    # Matched in memory; the session reads the matched rows and (re)loads the index
+    return [suggestion._asdict() for suggestion in typeahead_index.suggest(session, q, limit)]
+
+
+@router.post("/lookup", response_model=EmployeeLookupResult)
+def lookup_employee_batch(
+    lookup: EmployeeLookup,
+    session: Session = Depends(get_session),
+    _: bool = Depends(rate_limit_dependency),
+):
+    if len(lookup.ids) + len(lookup.emails) > settings.lookup_max_keys:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.lookup_max_keys} ids and emails can be looked up at once",
+        )
+
+    return lookup_employees(session=session, lookup=lookup, chunk_size=settings.lookup_chunk_size)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q-values (q=0 refuses)."""
+    qualities = {}
+    for entry in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in entry.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+
+    if "gzip" in qualities:
+        return qualities["gzip"] > 0
+    return qualities.get("*", 0.0) > 0
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_employee_list(
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    filters: ListEmployeeFilters = Depends(get_employee_filters),
+    session: Session = Depends(get_session),
+    _: None = Depends(filters_rate_limit),
+):
+    gzip = accepts_gzip(request.headers.get("accept-encoding", ""))
+    bind = session.get_bind()
+
+    def body():
+        # The body is produced after the endpoint returns, so it reads
+        # through its own session rather than the request-scoped one
+        with Session(bind) as export_session:
+            yield from export_employees(
+                export_session, filters, export_format, settings.export_batch_size, gzip=gzip,
+            )
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="employees.{export_format.value}"',
+        "Vary": "Accept-Encoding",
     }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
 
+    return StreamingResponse(body(), media_type=export_format.media_type, headers=headers)
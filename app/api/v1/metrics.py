@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.core.single_flight import async_listing_single_flight, listing_single_flight
+
+router = APIRouter()
+
+
+@router.get("")
+def get_metrics():
+    return {
+        "response_cache": response_cache.stats(),
+        "single_flight": (
+            async_listing_single_flight if settings.database_async else listing_single_flight
+        ).stats(),
+    }
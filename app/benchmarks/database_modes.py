@@ -0,0 +1,166 @@
+"""
+Compare the sync (threadpool) and async (event loop) listing paths under
+concurrency.
+
+    python -m app.benchmarks.database_modes --employees 200000 --requests 2000 --concurrency 64
+
+Both modes run `get_employee_page` against the same temporary SQLite file.
+The sync mode goes through `run_in_threadpool`, exactly like FastAPI does
+for a `def` endpoint; the async mode awaits `get_employee_page_async` on the
+loop.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import set_sqlite_pragma
+from app.models import Company, Department, Organisation
+from app.models.employee import EmployeeStatus
+from app.operations.employee import get_employee_page, get_employee_page_async
+from app.schemas.employee import ListEmployeeFilters
+
+
+LOCATIONS = ["Singapore", "Kuala Lumpur", "Jakarta", "Bangkok", "Manila"]
+POSITIONS = ["Software Engineer", "Product Manager", "Data Analyst", "Recruiter"]
+
+
+def seed(engine, num_employees: int, num_companies: int = 20) -> List[int]:
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        organisation = Organisation(name="Benchmark")
+        session.add(organisation)
+        session.commit()
+
+        companies = [Company(name=f"Company {i}", organisation_id=organisation.id) for i in range(num_companies)]
+        session.add_all(companies)
+        session.commit()
+
+        departments = [
+            Department(name="Engineering", company_id=company.id, organisation_id=organisation.id)
+            for company in companies
+        ]
+        session.add_all(departments)
+        session.commit()
+        company_ids = [company.id for company in companies]
+        department_by_company = {department.company_id: department.id for department in departments}
+
+    statuses = [status.value for status in EmployeeStatus]
+    rows = []
+    for i in range(num_employees):
+        company_id = random.choice(company_ids)
+        rows.append((
+            f"First{i % 5000}", f"Last{i % 7000}", f"employee{i}@bench.com", None,
+            random.choice(statuses), department_by_company[company_id], company_id, 1,
+            random.choice(POSITIONS), random.choice(LOCATIONS),
+        ))
+
+    raw = engine.raw_connection()
+    try:
+        raw.executemany(
+            "INSERT INTO employee (first_name, last_name, email, phone_number, status, "
+            "department_id, company_id, organisation_id, position, location) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+    return company_ids
+
+
+def random_filters(company_ids: List[int]) -> ListEmployeeFilters:
+    return ListEmployeeFilters(
+        page=random.randint(1, 20),
+        page_size=20,
+        company_ids=[random.choice(company_ids)],
+        locations=random.sample(LOCATIONS, 2),
+    )
+
+
+async def run(
+    name: str,
+    call: Callable[[ListEmployeeFilters], Awaitable],
+    company_ids: List[int],
+    num_requests: int,
+    concurrency: int,
+) -> None:
+    # Warm up: open every pooled connection before measuring
+    await asyncio.gather(*(call(random_filters(company_ids)) for _ in range(concurrency)))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one_request():
+        filters = random_filters(company_ids)
+        async with semaphore:
+            started_at = time.perf_counter()
+            await call(filters)
+            latencies.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(num_requests)))
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"  {name:<6} {num_requests / elapsed:>9.1f} req/s   p50 {p50:>8.2f} ms   p99 {p99:>8.2f} ms")
+
+
+async def main(num_employees: int, num_requests: int, concurrency: int) -> None:
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(db_fd)
+
+    sync_engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False, "timeout": 30.0},
+        pool_size=concurrency,
+    )
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", pool_size=concurrency)
+    for engine in (sync_engine, async_engine.sync_engine):
+        event.listen(engine, "connect", set_sqlite_pragma)
+
+    try:
+        print(f"Seeding {num_employees:,} employees into {db_path}...")
+        company_ids = seed(sync_engine, num_employees)
+
+        def sync_call(filters):
+            with Session(sync_engine) as session:
+                return get_employee_page(session, filters)
+
+        async def async_call(filters):
+            async with AsyncSession(async_engine) as session:
+                return await get_employee_page_async(session, filters)
+
+        print(f"{num_requests:,} requests, concurrency {concurrency}")
+        await run("sync", lambda filters: run_in_threadpool(sync_call, filters), company_ids, num_requests, concurrency)
+        await run("async", async_call, company_ids, num_requests, concurrency)
+    finally:
+        await async_engine.dispose()
+        sync_engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.employees, args.requests, args.concurrency))
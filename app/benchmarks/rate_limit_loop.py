@@ -0,0 +1,160 @@
+"""
+Measure how much each rate limiter stalls the event loop under load.
+
+    python -m app.benchmarks.rate_limit_loop --requests 200000 --concurrency 64 --threads 4
+
+`--concurrency` coroutines check the limiter the way the async dependency
+does, while `--threads` threads keep calling the threaded limiters as sync
+callers would, competing for their locks and the GIL. A heartbeat
+coroutine asks to wake up every millisecond; how late it wakes up is the
+time the loop was blocked, on top of the baseline that only yields. The
+per-check time is how long one limiter call takes from the caller's point
+of view (for the threadpool rows, including the hop to a worker thread).
+With the default `--threads 0` only the loop touches the limiters, as in
+the app, where every rate-limit dependency is async. Reported per limiter:
+
+  direct      the threaded limiter called on the loop (the old dependency)
+  threadpool  the threaded limiter run through run_in_threadpool
+  async       AsyncSlidingWindowRateLimiter (RATE_LIMITER=async)
+"""
+import argparse
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.async_rate_limiter import AsyncSlidingWindowRateLimiter
+from app.core.in_mem_rate_limiter import InMemoryRateLimiter
+from app.core.sliding_window_rate_limiter import SlidingWindowRateLimiter
+
+
+LIMIT = 5
+WINDOW = 30
+HEARTBEAT = 0.001
+
+
+def workload(num_clients: int, num_requests: int) -> List[str]:
+    return [f"10.0.{i >> 8 & 255}.{i & 255}" for i in random.choices(range(num_clients), k=num_requests)]
+
+
+async def heartbeat(lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT)
+        lags.append(time.perf_counter() - started_at - HEARTBEAT)
+
+
+async def drive(
+    check: Callable[[str], Awaitable[bool]], keys: List[str], concurrency: int,
+) -> Tuple[float, List[float], List[float]]:
+    blocked: List[float] = []
+
+    async def worker(chunk: List[str]):
+        for key in chunk:
+            started_at = time.perf_counter()
+            await check(key)
+            blocked.append(time.perf_counter() - started_at)
+            # Yield like a request would between its dependency and its handler
+            await asyncio.sleep(0)
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker(keys[i::concurrency]) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    stop.set()
+    await beat
+    return elapsed, lags, blocked
+
+
+def contend(limiter, keys: List[str], stop: threading.Event) -> None:
+    # A sync handler: hit the limiter, then wait on I/O with the GIL released
+    while not stop.is_set():
+        for key in keys[:1_000]:
+            limiter.rate_limit(key, limit=LIMIT, window=WINDOW)
+            time.sleep(0.0002)
+            if stop.is_set():
+                return
+
+
+def measure(name: str, limiter, check, keys: List[str], concurrency: int, threads: int) -> None:
+    stop = threading.Event()
+    background = [
+        threading.Thread(target=contend, args=(limiter, random.sample(keys, len(keys)), stop), daemon=True)
+        for _ in range(threads)
+    ]
+    for thread in background:
+        thread.start()
+
+    try:
+        elapsed, lags, blocked = asyncio.run(drive(check, keys, concurrency))
+    finally:
+        stop.set()
+        for thread in background:
+            thread.join()
+
+    print(
+        f"  {name:<26} {len(keys) / elapsed:>9,.0f} req/s"
+        f"   loop lag p99 {percentile(lags, 0.99) * 1e3:>6.2f} ms  max {percentile(lags, 1) * 1e3:>6.2f} ms"
+        f"   per check p99 {percentile(blocked, 0.99) * 1e6:>7.1f} us"
+    )
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def main(num_clients: int, num_requests: int, concurrency: int, threads: int) -> None:
+    keys = workload(num_clients, num_requests)
+    print(
+        f"{num_requests:,} requests from {num_clients:,} clients, {concurrency} coroutines,"
+        f" {threads} contending threads (limit {LIMIT} per {WINDOW}s)"
+    )
+
+    async def noop(key: str) -> bool:
+        return True
+
+    measure("baseline (no limiter)", SlidingWindowRateLimiter(), noop, keys, concurrency, threads)
+
+    for limiter_name, create in (("in_memory", InMemoryRateLimiter), ("sliding_window", SlidingWindowRateLimiter)):
+        limiter = create()
+
+        async def direct(key: str, limiter=limiter) -> bool:
+            return limiter.rate_limit(key, limit=LIMIT, window=WINDOW)
+
+        measure(f"{limiter_name} direct", limiter, direct, keys, concurrency, threads)
+
+        limiter = create()
+
+        async def threadpool(key: str, limiter=limiter) -> bool:
+            return await run_in_threadpool(limiter.rate_limit, key, limit=LIMIT, window=WINDOW)
+
+        measure(f"{limiter_name} threadpool", limiter, threadpool, keys, concurrency, threads)
+
+    async_limiter = AsyncSlidingWindowRateLimiter()
+
+    async def loop_owned(key: str) -> bool:
+        return await async_limiter.rate_limit(key, limit=LIMIT, window=WINDOW)
+
+    # Threads can't share it, so they get their own limiter to keep the GIL as busy
+    measure("async", SlidingWindowRateLimiter(), loop_owned, keys, concurrency, threads)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args.clients, args.requests, args.concurrency, args.threads)
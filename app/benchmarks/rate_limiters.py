@@ -0,0 +1,81 @@
+"""
+Compare the rate limiters at many distinct clients.
+
+    python -m app.benchmarks.rate_limiters --clients 100000 --requests-per-client 5 --threads 8
+
+Every client (a distinct key, like one IP) sends its requests in random
+order across the worker threads. For each limiter the benchmark reports
+throughput single-threaded and with --threads threads, plus the memory
+held by the limiter once all clients are done and, for limiters that evict,
+after the clients have gone idle.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from app.core.in_mem_rate_limiter import InMemoryRateLimiter
+from app.core.sliding_window_rate_limiter import SlidingWindowRateLimiter
+
+
+LIMIT = 5
+WINDOW = 30
+
+
+def workload(num_clients: int, requests_per_client: int) -> List[str]:
+    keys = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(num_clients)] * requests_per_client
+    random.shuffle(keys)
+    return keys
+
+
+def run(limiter, keys: List[str], threads: int) -> float:
+    def call(chunk: List[str]):
+        for key in chunk:
+            limiter.rate_limit(key, limit=LIMIT, window=WINDOW)
+
+    chunks = [keys[i::threads] for i in range(threads)]
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(call, chunks))
+    return len(keys) / (time.perf_counter() - started_at)
+
+
+def measure(name: str, create: Callable, keys: List[str], threads: int) -> None:
+    single = run(create(), keys, 1)
+    threaded = run(create(), keys, threads)
+
+    tracemalloc.start()
+    limiter = create()
+    run(limiter, keys, 1)
+    held = tracemalloc.get_traced_memory()[0]
+
+    idle = "-"
+    if isinstance(limiter, SlidingWindowRateLimiter):
+        limiter.evict_idle(now=time.monotonic() + 2 * WINDOW)
+        idle = f"{tracemalloc.get_traced_memory()[0] / 1e6:>6.1f} MB"
+    tracemalloc.stop()
+
+    print(
+        f"  {name:<15} {single:>11,.0f} req/s   {threaded:>11,.0f} req/s ({threads} threads)"
+        f"   {held / 1e6:>6.1f} MB held   {idle} after idle"
+    )
+
+
+def main(num_clients: int, requests_per_client: int, threads: int) -> None:
+    keys = workload(num_clients, requests_per_client)
+    print(f"{num_clients:,} clients x {requests_per_client} requests (limit {LIMIT} per {WINDOW}s)")
+
+    measure("in_memory", InMemoryRateLimiter, keys, threads)
+    measure("sliding_window", SlidingWindowRateLimiter, keys, threads)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--requests-per-client", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    main(args.clients, args.requests_per_client, args.threads)
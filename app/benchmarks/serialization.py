@@ -0,0 +1,122 @@
+"""
+Compare the ways a listing page can be turned into JSON bytes.
+
+    python -m app.benchmarks.serialization --page-size 100 --iterations 2000
+
+The rows come from a real `get_employee_page` call against an in-memory
+SQLite database, so the serializers see the same `Row` objects as the
+endpoint:
+
+  fastapi   validate into PaginatedResponse[Employee], dump to Python, json.dumps
+            (what FastAPI does for a `response_model` endpoint)
+  pydantic  validate into PaginatedResponse[Employee], model_dump_json
+            (the response-cache path)
+  fast      serialize_employee_page (RESPONSE_SERIALIZER=fast)
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Callable, List
+
+from sqlmodel import SQLModel, Session, create_engine
+
+from app.models import Company, Department, Employee, Organisation
+from app.models.employee import EmployeeStatus
+from app.operations.employee import EmployeePage, get_employee_page
+from app.operations.serialization import serialize_employee_page
+from app.schemas.employee import Employee as EmployeeSchema
+from app.schemas.employee import ListEmployeeFilters
+from app.schemas.pagination import PaginatedResponse
+
+
+def load_page(page_size: int) -> EmployeePage:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        organisation = Organisation(name="Benchmark")
+        session.add(organisation)
+        session.commit()
+
+        company = Company(name="Benchmark Company", organisation_id=organisation.id)
+        session.add(company)
+        session.commit()
+
+        department = Department(name="Engineering", company_id=company.id, organisation_id=organisation.id)
+        session.add(department)
+        session.commit()
+
+        session.add_all(
+            Employee(
+                first_name=f"First{i}", last_name=f"Last{i}", email=f"employee{i}@bench.com",
+                phone_number=f"+65 6000 {i:04d}", status=EmployeeStatus.ACTIVE,
+                company_id=company.id, department_id=department.id, organisation_id=organisation.id,
+                position="Software Engineer", location="Singapore",
+            )
+            for i in range(page_size)
+        )
+        session.commit()
+
+        return get_employee_page(session, ListEmployeeFilters(page_size=page_size))
+
+
+def content(filters: ListEmployeeFilters, page: EmployeePage) -> dict:
+    return {
+        "page": filters.page,
+        "page_size": filters.page_size,
+        "total": page.total,
+        "total_is_estimate": page.total_is_estimate,
+        "total_pages": 1,
+        "data": page.employees,
+        "next_cursor": page.next_cursor,
+    }
+
+
+def run(name: str, serialize: Callable[[], bytes], iterations: int, baseline: List[float]) -> List[float]:
+    for _ in range(min(iterations, 100)):
+        serialize()
+
+    timings = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        serialize()
+        timings.append(time.perf_counter() - started_at)
+
+    median = statistics.median(timings) * 1_000_000
+    speedup = f"{statistics.median(baseline) / statistics.median(timings):>6.1f}x" if baseline else ""
+    print(f"  {name:<9} median {median:>9.1f} µs   {len(serialize()):>7,} bytes   {speedup}")
+    return timings
+
+
+def main(page_size: int, iterations: int) -> None:
+    filters = ListEmployeeFilters(page_size=page_size)
+    page = load_page(page_size)
+    response_model = PaginatedResponse[EmployeeSchema]
+
+    def fastapi_path() -> bytes:
+        model = response_model.model_validate(content(filters, page), from_attributes=True)
+        return json.dumps(model.model_dump(mode="json", exclude_unset=True)).encode()
+
+    def pydantic_path() -> bytes:
+        model = response_model.model_validate(content(filters, page), from_attributes=True)
+        return model.model_dump_json(exclude_unset=True).encode()
+
+    def fast_path() -> bytes:
+        return serialize_employee_page(filters, page, 1)
+
+    assert fast_path() == pydantic_path()
+
+    print(f"Page of {page_size} employees, {iterations:,} iterations")
+    baseline = run("fastapi", fastapi_path, iterations, [])
+    run("pydantic", pydantic_path, iterations, baseline)
+    run("fast", fast_path, iterations, baseline)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    main(args.page_size, args.iterations)
@@ -0,0 +1,63 @@
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from app.core.rate_limiter import AsyncRateLimiter
+from app.core.sliding_window_rate_limiter import _Window, slide
+
+
+class AsyncSlidingWindowRateLimiter(AsyncRateLimiter):
+    """
+    Sliding-window-counter rate limiter for the event loop.
+
+    Counts like `SlidingWindowRateLimiter`, but all state belongs to the loop
+    thread: `rate_limit` never awaits, so each call reads and updates its
+    counter atomically with respect to every other coroutine, and no lock is
+    ever taken. A request that is being limited can't stall the others.
+
+    Keys are kept in least-recently-used order. Every call drops at most
+    `evict_batch` keys from the cold end once they have been idle for two
+    windows, so eviction is spread over requests instead of a periodic
+    sweep that would hold the loop.
+
+    Not thread-safe: only call it from the loop that serves the requests.
+    """
+
+    def __init__(self, evict_batch: int = 8, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.evict_batch = evict_batch
+        self.windows: "OrderedDict[str, _Window]" = OrderedDict()
+        self.evictions = 0
+
+    async def rate_limit(self, key: str, limit: int, window: int, cost: int = 1) -> bool:
+        now = self.clock()
+        self._evict_idle(now)
+
+        state = self.windows.get(key)
+        if state is None or state.length != window:
+            state = self.windows[key] = _Window(now, window)
+        else:
+            self.windows.move_to_end(key)
+
+        state.start, state.current, state.previous, used = slide(
+            state.start, state.current, state.previous, window, now,
+        )
+        if used + cost > limit:
+            return False
+
+        state.current += cost
+        return True
+
+    def _evict_idle(self, now: float) -> None:
+        windows = self.windows
+        for _ in range(self.evict_batch):
+            if not windows:
+                return
+            key, state = next(iter(windows.items()))
+            if now - state.start < 2 * state.length:
+                return
+            del windows[key]
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self.windows)
@@ -0,0 +1,33 @@
+from threading import Lock, Thread
+from typing import Callable
+
+
+class BackgroundRefresh:
+    """
+    Runs a reload on a daemon thread, at most one at a time.
+
+    `start()` returns False without doing anything while a previous reload
+    is still running, so callers can ask for a refresh on every request
+    that notices stale data.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lock = Lock()
+        self.running = False
+
+    def start(self, reload: Callable[[], None]) -> bool:
+        with self.lock:
+            if self.running:
+                return False
+            self.running = True
+
+        def run():
+            try:
+                reload()
+            finally:
+                with self.lock:
+                    self.running = False
+
+        Thread(target=run, name=self.name, daemon=True).start()
+        return True
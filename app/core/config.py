@@ -1,6 +1,16 @@
+import os
+import tempfile
+from typing import Dict
+
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class RateLimit(BaseModel):
+    limit: int  # requests per window
+    window: int  # seconds
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -9,6 +19,101 @@ class Settings(BaseSettings):
     
     # Database settings
     database_url: str = "sqlite:///./employee_search.db"
+    # Serve listings on the event loop through an async engine (aiosqlite)
+    database_async: bool = False
+    
+    @property
+    def async_database_url(self) -> str:
+        return self.database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    
+    # Search settings
+    # "like": substring match with LIKE (full scan)
+    # "fts": prefix match through the employee_fts FTS5 index
+    search_backend: str = "like"
+    
+    # search_mode=fuzzy: names whose trigram similarity to a search token is
+    # at least fuzzy_similarity_threshold (best fuzzy_max_terms per token)
+    fuzzy_similarity_threshold: float = 0.3
+    fuzzy_max_terms: int = 20
+    fuzzy_vocabulary_ttl: float = 300.0
+    
+    # Listing totals
+    # "exact": COUNT on every request
+    # "cached": COUNT memoized per filter set until count_cache_ttl or a write
+    # "estimate": derived from per-dimension statistics (searches stay exact)
+    count_strategy: str = "exact"
+    count_cache_ttl: float = 60.0
+    count_cache_max_entries: int = 10_000
+    count_statistics_ttl: float = 300.0
+    
+    # "serial": count, then page on the request's connection
+    # "parallel": count on a second pooled connection while the page is fetched
+    query_execution: str = "serial"
+    query_executor_workers: int = 8
+    
+    # Serve filter-only listings from the in-memory bitmap index
+    filter_index_enabled: bool = False
+    
+    # How often in-memory copies re-read the trigger-maintained table versions
+    # to notice writes from other workers, tasks or raw SQL
+    table_version_check_interval: float = 1.0
+    
+    # Cache of rendered listing responses, invalidated by ORM writes
+    response_cache_enabled: bool = False
+    response_cache_max_entries: int = 1024
+    response_cache_ttl: float = 30.0
+    
+    # Share one DB execution between concurrent identical listing requests
+    single_flight_enabled: bool = True
+    
+    # How listing responses are rendered
+    # "pydantic": validated into PaginatedResponse[Employee] model by model
+    # "fast": SQL rows encoded straight to JSON bytes, same schema
+    response_serializer: str = "pydantic"
+    
+    # Rows fetched from the server-side cursor per chunk of an export
+    export_batch_size: int = 1000
+    
+    # Batch lookup: most ids + emails per request, and per IN (...) query
+    lookup_max_keys: int = 1000
+    lookup_chunk_size: int = 500
+    
+    # Load the typeahead prefix index at startup instead of on first use
+    typeahead_preload: bool = False
+    
+    # Rate limiting
+    # "async": per-key sliding window counter owned by the event loop, no locks
+    # "sliding_window": per-key sliding window counter, sharded, idle keys evicted
+    # "in_memory": per-key timestamp log behind one lock
+    # "shared_memory": sliding window counters in an mmap'd table shared by
+    #   all worker processes on the host
+    # "redis": sliding window counters on the Redis server at rate_limiter_redis_url
+    rate_limiter: str = "async"
+    rate_limiter_shards: int = 64
+    rate_limiter_eviction_interval: float = 60.0
+    rate_limiter_shared_memory_path: str = os.path.join(tempfile.gettempdir(), "employee_search_rate_limit")
+    rate_limiter_shared_memory_slots: int = 65_536
+    rate_limiter_redis_url: str = "redis://localhost:6379/0"
+    
+    # Default limit per client, overridden per route path (e.g.
+    # RATE_LIMIT_ROUTES='{"/api/v1/employees/export": {"limit": 2, "window": 60}}')
+    # and per client key (RATE_LIMIT_KEYS='{"10.0.0.5": {"limit": 100, "window": 30}}').
+    # A route with its own limit gets its own counter per client. Typeahead
+    # sends a request per keystroke, so it has a looser limit of its own;
+    # setting RATE_LIMIT_ROUTES replaces it.
+    rate_limit: RateLimit = RateLimit(limit=5, window=30)
+    rate_limit_routes: Dict[str, RateLimit] = {
+        "/api/v1/employees/typeahead": RateLimit(limit=60, window=10),
+    }
+    rate_limit_keys: Dict[str, RateLimit] = {}
+    
+    # Charge listing, facet and export requests by estimated cost instead of
+    # one unit each (see app.operations.cost); limits are then in cost units
+    rate_limit_costs_enabled: bool = False
+    rate_limit_cost_search: int = 4
+    rate_limit_cost_offset_rows: int = 1_000
+    rate_limit_cost_page_rows: int = 50
+    rate_limit_cost_matched_rows: int = 100_000
     
     # API settings
     api_v1_prefix: str = "/api/v1"
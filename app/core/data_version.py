@@ -0,0 +1,121 @@
+from itertools import count
+from threading import Lock
+from typing import Callable, Dict, Hashable, Iterable, List, NamedTuple, Set, Tuple, Type, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.company import Company
+from app.models.department import Department
+from app.models.employee import Employee
+
+
+TRACKED_MODELS = (Employee, Company, Department)
+
+
+class DataVersion:
+    """
+    A process-wide counter bumped whenever a write to employee, company or
+    department rows through the ORM is committed. Caches store the version
+    they were filled at and treat any entry from an older version as stale.
+
+    Writes made outside this process (or with raw SQL) are not seen; call
+    `bump()` after those.
+    """
+
+    def __init__(self):
+        self._counter = count(1)
+        self._lock = Lock()
+        self.current = 0
+
+    def bump(self) -> int:
+        with self._lock:
+            self.current = next(self._counter)
+            return self.current
+
+
+data_version = DataVersion()
+
+
+class _ChangeTracker(NamedTuple):
+    models: Union[Type, Tuple[Type, ...]]
+    keys: Callable[[object], Iterable[Hashable]]
+    on_commit: Callable[[Set[Hashable]], None]
+    on_bulk: Callable[[], None]
+
+
+_trackers: List[_ChangeTracker] = []
+
+_CHANGED_KEY = "tracked_changes"
+_BULK_KEY = "tracked_bulk_changes"
+
+
+def _primary_key(obj) -> Iterable[Hashable]:
+    return (obj.id,)
+
+
+def track_changes(
+    models: Union[Type, Tuple[Type, ...]],
+    on_commit: Callable[[Set[Hashable]], None],
+    on_bulk: Callable[[], None],
+    keys: Callable[[object], Iterable[Hashable]] = _primary_key,
+) -> None:
+    """
+    Follow ORM writes to `models`.
+
+    `keys(obj)` is collected for every written row at flush time, and once
+    the transaction commits `on_commit` receives them all. A bulk INSERT /
+    UPDATE / DELETE statement names no rows, so its commit calls `on_bulk()`
+    instead. Nothing is called for a rolled back transaction, and nothing
+    before the commit: a reader running in between still sees the old rows
+    and must not be told they changed.
+    """
+    _trackers.append(_ChangeTracker(models, keys, on_commit, on_bulk))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_on_flush(session, flush_context):
+    written = (*session.new, *session.dirty, *session.deleted)
+    for position, tracker in enumerate(_trackers):
+        keys = [key for obj in written if isinstance(obj, tracker.models) for key in tracker.keys(obj)]
+        keys = [key for key in keys if key is not None]
+        if keys:
+            changes: Dict[int, Set[Hashable]] = session.info.setdefault(_CHANGED_KEY, {})
+            changes.setdefault(position, set()).update(keys)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_on_bulk_statement(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    for position, tracker in enumerate(_trackers):
+        if issubclass(mapper.class_, tracker.models):
+            orm_execute_state.session.info.setdefault(_BULK_KEY, set()).add(position)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_on_commit(session):
+    changes = session.info.pop(_CHANGED_KEY, {})
+    bulk = session.info.pop(_BULK_KEY, set())
+    for position, tracker in enumerate(_trackers):
+        if position in bulk:
+            tracker.on_bulk()
+        elif changes.get(position):
+            tracker.on_commit(changes[position])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_CHANGED_KEY, None)
+    session.info.pop(_BULK_KEY, None)
+
+
+track_changes(
+    TRACKED_MODELS,
+    on_commit=lambda ids: data_version.bump(),
+    on_bulk=data_version.bump,
+)
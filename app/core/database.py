@@ -1,9 +1,14 @@
+from functools import lru_cache
 from sqlmodel import SQLModel, create_engine, Session
-from typing import Generator
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import AsyncGenerator, Generator
 from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from app.core.config import settings
 from app.models import *
+# Register the trigger DDL that keeps derived tables in sync with employee
+from app.core import employee_names, facet_index, search_index, table_versions
 
 
 connect_args = {}
@@ -22,7 +27,6 @@ engine = create_engine(
 
 
 # Enable WAL mode for SQLite (better concurrency)
-@event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
     if settings.database_url.startswith("sqlite"):
         cursor = dbapi_conn.cursor()
@@ -33,6 +37,24 @@ def set_sqlite_pragma(dbapi_conn, connection_record):
         cursor.close()
 
 
+event.listen(engine, "connect", set_sqlite_pragma)
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """
+    Engine for the async request path (DATABASE_ASYNC), created on first use
+    so the async driver is only needed when that path is enabled.
+    """
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        echo=False,
+        connect_args=connect_args,
+    )
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragma)
+    return async_engine
+
+
 def init_db():
     SQLModel.metadata.create_all(engine)
 
@@ -41,3 +63,7 @@ def get_session() -> Generator[Session, None, None]:
     with Session(engine) as session:
         yield session
 
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
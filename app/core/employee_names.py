@@ -0,0 +1,75 @@
+from sqlalchemy import DDL, event, inspect, text
+from sqlalchemy.engine import Connection
+
+from app.models.company import Company
+from app.models.department import Department
+from app.models.employee import Employee
+
+
+_FILL_NAMES = """
+    UPDATE employee SET
+        company_name = (SELECT name FROM company WHERE company.id = new.company_id),
+        department_name = (SELECT name FROM department WHERE department.id = new.department_id)
+    WHERE id = new.id;
+"""
+
+# `employee.company_name` / `employee.department_name` copy the names of the
+# referenced rows so listings can be served from employee alone.
+EMPLOYEE_NAMES_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employee_names_ai AFTER INSERT ON employee BEGIN
+        {_FILL_NAMES}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employee_names_au AFTER UPDATE OF company_id, department_id ON employee BEGIN
+        {_FILL_NAMES}
+    END
+    """,
+]
+
+COMPANY_NAMES_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS company_name_au AFTER UPDATE OF name ON company BEGIN
+        UPDATE employee SET company_name = new.name WHERE company_id = new.id;
+    END
+    """,
+]
+
+DEPARTMENT_NAMES_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS department_name_au AFTER UPDATE OF name ON department BEGIN
+        UPDATE employee SET department_name = new.name WHERE department_id = new.id;
+    END
+    """,
+]
+
+
+# Keep the copies in sync for every database created through the metadata.
+for model, statements in (
+    (Employee, EMPLOYEE_NAMES_DDL),
+    (Company, COMPANY_NAMES_DDL),
+    (Department, DEPARTMENT_NAMES_DDL),
+):
+    for statement in statements:
+        event.listen(model.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+
+def add_name_columns(connection: Connection) -> None:
+    existing = {column["name"] for column in inspect(connection).get_columns("employee")}
+    for column in ("company_name", "department_name"):
+        if column not in existing:
+            connection.execute(text(f"ALTER TABLE employee ADD COLUMN {column} VARCHAR"))
+
+
+def create_name_triggers(connection: Connection) -> None:
+    for statement in EMPLOYEE_NAMES_DDL + COMPANY_NAMES_DDL + DEPARTMENT_NAMES_DDL:
+        connection.execute(text(statement))
+
+
+def backfill_employee_names(connection: Connection) -> None:
+    connection.execute(text("""
+        UPDATE employee SET
+            company_name = (SELECT name FROM company WHERE company.id = employee.company_id),
+            department_name = (SELECT name FROM department WHERE department.id = employee.department_id)
+    """))
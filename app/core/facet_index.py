@@ -0,0 +1,80 @@
+from sqlalchemy import DDL, event, text
+from sqlalchemy.engine import Connection
+
+from app.models.employee import Employee
+
+
+FACET_TABLE = "employee_facet_count"
+
+FACET_KEY = "status, company_id, department_id, position, location"
+
+# Stored in place of NULL so that every combination has a usable unique key
+NULL_DEPARTMENT_ID = 0
+NULL_TEXT = ""
+
+
+def _facet_values(row: str) -> str:
+    return (
+        f"{row}.status, {row}.company_id, IFNULL({row}.department_id, {NULL_DEPARTMENT_ID}), "
+        f"IFNULL({row}.position, '{NULL_TEXT}'), IFNULL({row}.location, '{NULL_TEXT}')"
+    )
+
+
+def _facet_match(row: str) -> str:
+    return (
+        f"status = {row}.status AND company_id = {row}.company_id "
+        f"AND department_id = IFNULL({row}.department_id, {NULL_DEPARTMENT_ID}) "
+        f"AND position = IFNULL({row}.position, '{NULL_TEXT}') "
+        f"AND location = IFNULL({row}.location, '{NULL_TEXT}')"
+    )
+
+
+_INCREMENT = f"""
+    INSERT INTO {FACET_TABLE}({FACET_KEY}, count) VALUES ({_facet_values("new")}, 1)
+    ON CONFLICT({FACET_KEY}) DO UPDATE SET count = count + 1;
+"""
+
+_DECREMENT = f"""
+    UPDATE {FACET_TABLE} SET count = count - 1 WHERE {_facet_match("old")};
+    DELETE FROM {FACET_TABLE} WHERE count <= 0 AND {_facet_match("old")};
+"""
+
+FACET_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FACET_TABLE}_ai AFTER INSERT ON employee BEGIN
+        {_INCREMENT}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FACET_TABLE}_ad AFTER DELETE ON employee BEGIN
+        {_DECREMENT}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FACET_TABLE}_au
+    AFTER UPDATE OF status, company_id, department_id, position, location ON employee BEGIN
+        {_DECREMENT}
+        {_INCREMENT}
+    END
+    """,
+]
+
+
+# Keep the aggregate in sync for every database created through the metadata.
+for statement in FACET_DDL:
+    event.listen(Employee.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+
+def create_facet_triggers(connection: Connection) -> None:
+    for statement in FACET_DDL:
+        connection.execute(text(statement))
+
+
+def rebuild_facet_counts(connection: Connection) -> None:
+    connection.execute(text(f"DELETE FROM {FACET_TABLE}"))
+    connection.execute(text(f"""
+        INSERT INTO {FACET_TABLE}({FACET_KEY}, count)
+        SELECT {_facet_values("employee")}, COUNT(*)
+        FROM employee
+        GROUP BY {_facet_values("employee")}
+    """))
@@ -0,0 +1,177 @@
+import time
+from enum import Enum
+from threading import Lock
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from app.core.background_refresh import BackgroundRefresh
+from app.core.data_version import DataVersion, track_changes
+from app.core.table_versions import table_versions
+from app.models.employee import Employee
+from app.schemas.employee import FILTER_COLUMNS, ListEmployeeFilters
+
+
+# Bumped only by committed employee writes: the bitmaps read nothing else, so
+# company, department and organisation settings writes leave the index current
+employee_version = DataVersion()
+
+
+class FilterIndexResult(NamedTuple):
+    total: int
+    ids: List[int]
+    has_more: bool
+
+
+class FilterIndex:
+    """
+    In-memory bitmap index over the low-cardinality listing filters.
+
+    Employee ids are loaded in ascending order into one array, and every
+    distinct value of every filter dimension gets a packed bitset over that
+    array (one bit per employee). A filter combination is answered with
+    vectorized OR within a dimension and AND across dimensions, which gives
+    both the total and the ids of the requested page without touching SQLite.
+
+    The index is a snapshot: it remembers the employee versions it was
+    loaded at and `is_current()` turns false once an employee write commits,
+    immediately for ORM writes in this process and within
+    TABLE_VERSION_CHECK_INTERVAL seconds for any other write (other workers,
+    tasks, raw SQL), through the trigger-maintained `table_version` counter.
+    Callers fall back to SQL while `refresh_in_background()` rebuilds it from
+    the engine it was first loaded from. A rebuild re-reads every employee
+    (roughly 15 s per million rows) and briefly holds two copies of the
+    bitmaps, so write-heavy deployments spend most of their time on SQL.
+    """
+
+    DIMENSIONS = FILTER_COLUMNS
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.bitmaps: Dict[str, Dict[Any, np.ndarray]] = {}
+        self.version: Optional[int] = None
+        self.table_version = 0
+        self.loaded_at: Optional[float] = None
+        self.engine: Optional[Engine] = None
+        self.lock = Lock()
+        self.refresher = BackgroundRefresh("filter-index-refresh")
+
+    @staticmethod
+    def _normalize(value: Any) -> Any:
+        return value.value if isinstance(value, Enum) else value
+
+    def load(self, session: Session, batch_size: int = 100_000) -> None:
+        version = employee_version.current
+        # Read in the same transaction as the rows, so it matches the snapshot
+        table_version = table_versions.read(session, Employee.__tablename__)
+        query = select(Employee.id, *self.DIMENSIONS.values()).order_by(Employee.id)
+
+        ids: List[int] = []
+        # Dictionary-encode every dimension: distinct value -> code, one code per row
+        dictionaries: List[Dict[Any, int]] = [{} for _ in self.DIMENSIONS]
+        codes: List[List[int]] = [[] for _ in self.DIMENSIONS]
+
+        result = session.exec(query.execution_options(yield_per=batch_size))
+        for row in result:
+            ids.append(row[0])
+            for position, value in enumerate(row[1:]):
+                dictionary = dictionaries[position]
+                value = self._normalize(value)
+                code = dictionary.get(value)
+                if code is None:
+                    code = dictionary[value] = len(dictionary)
+                codes[position].append(code)
+
+        bitmaps = {}
+        for name, dictionary, column_codes in zip(self.DIMENSIONS, dictionaries, codes):
+            encoded = np.fromiter(column_codes, dtype=np.int32, count=len(column_codes))
+            bitmaps[name] = {
+                value: np.packbits(encoded == code)
+                for value, code in dictionary.items()
+            }
+
+        with self.lock:
+            self.ids = np.fromiter(ids, dtype=np.int64, count=len(ids))
+            self.bitmaps = bitmaps
+            self.version = version
+            self.table_version = table_version
+            self.loaded_at = time.monotonic()
+            self.engine = session.get_bind()
+
+    def is_current(self, session: Session) -> bool:
+        if self.version is None or self.version != employee_version.current:
+            return False
+        return table_versions.current(session, Employee.__tablename__) <= self.table_version
+
+    def invalidate(self) -> None:
+        employee_version.bump()
+
+    def refresh_in_background(self) -> None:
+        """Reload from a fresh session on a worker thread; at most one reload runs at a time."""
+        engine = self.engine
+        if engine is None:
+            return
+
+        def reload():
+            with Session(engine) as session:
+                self.load(session)
+
+        self.refresher.start(reload)
+
+    def _match(self, filters: ListEmployeeFilters, bitmaps, size: int) -> Optional[np.ndarray]:
+        matched = None
+        empty = np.zeros((size + 7) // 8, dtype=np.uint8)
+
+        for name in self.DIMENSIONS:
+            values = filters.filter_values(name)
+            if not values:
+                continue
+
+            dimension = empty
+            for value in values:
+                bitmap = bitmaps[name].get(self._normalize(value))
+                if bitmap is not None:
+                    dimension = dimension | bitmap
+
+            matched = dimension if matched is None else matched & dimension
+
+        return matched
+
+    def search(
+        self,
+        filters: ListEmployeeFilters,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+    ) -> FilterIndexResult:
+        """
+        Resolve the filters of a listing (search is not supported) to the
+        total and the ids of one page, in ascending id order.
+        """
+        with self.lock:
+            ids, bitmaps = self.ids, self.bitmaps
+
+        matched = self._match(filters, bitmaps, len(ids))
+        if matched is None:
+            matching_ids = ids
+        else:
+            mask = np.unpackbits(matched, count=len(ids)).view(bool)
+            matching_ids = ids[mask]
+
+        start = offset
+        if after_id is not None:
+            start = int(np.searchsorted(matching_ids, after_id, side="right"))
+
+        end = start + filters.page_size
+        return FilterIndexResult(
+            total=len(matching_ids),
+            ids=matching_ids[start:end].tolist(),
+            has_more=end < len(matching_ids),
+        )
+
+
+filter_index = FilterIndex()
+
+
+track_changes(Employee, on_commit=lambda ids: employee_version.bump(), on_bulk=employee_version.bump)
@@ -2,8 +2,10 @@ import time
 from threading import Lock
 from typing import Dict, List
 
+from app.core.rate_limiter import RateLimiter
 
-class InMemoryRateLimiter:
+
+class InMemoryRateLimiter(RateLimiter):
     """
     A simple in-memory rate limiter for demo purposes.
 
@@ -23,14 +25,14 @@ class InMemoryRateLimiter:
         self.cache: Dict[str, List[float]] = {}
         self.lock = Lock()
 
-    def rate_limit(self, key: str, limit: int, window: int) -> bool:
+    def rate_limit(self, key: str, limit: int, window: int, cost: int = 1) -> bool:
         now = time.time()
 
         with self.lock:
             if key not in self.cache:
                 self.cache[key] = []
 
-            self.cache[key].append(now)
+            self.cache[key].extend([now] * cost)
 
             self.cache[key] = [t for t in self.cache[key] if t > now - window]
 
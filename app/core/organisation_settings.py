@@ -0,0 +1,138 @@
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import inspect
+from sqlmodel import Session, select
+
+from app.core.data_version import data_version, track_changes
+from app.core.table_versions import table_versions
+from app.models.organisation_settings import OrganisationSettings
+
+
+class OrganisationConfig(NamedTuple):
+    """Typed view of one organisation's `OrganisationSettings.settings` JSON."""
+
+    # None means "show every column"
+    employee_display_columns: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def from_settings(cls, raw: Optional[Dict[str, Any]]) -> "OrganisationConfig":
+        raw = raw or {}
+        display_columns = raw.get("employee_display_columns")
+        return cls(
+            employee_display_columns=None if display_columns is None else tuple(display_columns),
+        )
+
+
+DEFAULT_CONFIG = OrganisationConfig()
+
+
+class OrganisationSettingsStore:
+    """
+    All organisation settings, decoded once and kept in memory.
+
+    The map is immutable and replaced as a whole, so request paths read it
+    without a lock or a query. ORM writes to `OrganisationSettings` mark the
+    organisations they touch once their transaction commits; the next read
+    re-fetches only those rows and swaps in an updated copy. Any other write
+    (a bulk statement, another worker, a task, raw SQL) advances the
+    trigger-maintained `table_version` counter, which reads compare with the
+    counter the map was loaded at, at most every
+    TABLE_VERSION_CHECK_INTERVAL seconds; the map is then reloaded whole.
+    """
+
+    def __init__(self):
+        self.configs: Mapping[int, OrganisationConfig] = MappingProxyType({})
+        self.loaded = False
+        self.table_version = 0
+        self.changed: Set[int] = set()
+        self.lock = Lock()
+
+    def load(self, session: Session) -> None:
+        table_version = table_versions.read(session, OrganisationSettings.__tablename__)
+        rows = session.exec(select(OrganisationSettings.organisation_id, OrganisationSettings.settings)).all()
+        configs = {organisation_id: OrganisationConfig.from_settings(raw) for organisation_id, raw in rows}
+
+        with self.lock:
+            self.configs = MappingProxyType(configs)
+            self.loaded = True
+            self.table_version = table_version
+            self.changed.clear()
+
+    def mark_changed(self, organisation_ids: Iterable[int]) -> None:
+        with self.lock:
+            self.changed.update(organisation_ids)
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.loaded = False
+
+    def clear(self) -> None:
+        with self.lock:
+            self.configs = MappingProxyType({})
+            self.loaded = False
+            self.changed.clear()
+
+    def _refresh(self, session: Session) -> None:
+        if not self.loaded:
+            self.load(session)
+            return
+
+        with self.lock:
+            organisation_ids, self.changed = self.changed, set()
+
+        rows = session.exec(
+            select(OrganisationSettings.organisation_id, OrganisationSettings.settings)
+            .where(OrganisationSettings.organisation_id.in_(organisation_ids))
+        ).all()
+        refreshed = {organisation_id: OrganisationConfig.from_settings(raw) for organisation_id, raw in rows}
+
+        with self.lock:
+            configs = dict(self.configs)
+            for organisation_id in organisation_ids:
+                configs.pop(organisation_id, None)
+            configs.update(refreshed)
+            self.configs = MappingProxyType(configs)
+
+    def _changed_elsewhere(self, session: Session) -> bool:
+        return table_versions.current(session, OrganisationSettings.__tablename__) > self.table_version
+
+    def get(self, session: Session, organisation_id: int) -> OrganisationConfig:
+        if self.loaded and self._changed_elsewhere(session):
+            self.invalidate()
+            # Cached listings were rendered with the previous display columns
+            data_version.bump()
+        if not self.loaded or self.changed:
+            self._refresh(session)
+        return self.configs.get(organisation_id, DEFAULT_CONFIG)
+
+    def display_columns(self, session: Session, organisation_id: int) -> Optional[Tuple[str, ...]]:
+        return self.get(session, organisation_id).employee_display_columns
+
+
+organisation_settings_store = OrganisationSettingsStore()
+
+
+def _changed_organisations(obj: OrganisationSettings) -> Iterable[int]:
+    # An entry moved to another organisation also changes the old one
+    return (obj.organisation_id, *inspect(obj).attrs.organisation_id.history.deleted)
+
+
+def _apply_changed_settings(organisation_ids: Set[int]) -> None:
+    organisation_settings_store.mark_changed(organisation_ids)
+    # Cached listings were rendered with the previous display columns
+    data_version.bump()
+
+
+def _invalidate_settings() -> None:
+    organisation_settings_store.invalidate()
+    data_version.bump()
+
+
+track_changes(
+    OrganisationSettings,
+    on_commit=_apply_changed_settings,
+    on_bulk=_invalidate_settings,
+    keys=_changed_organisations,
+)
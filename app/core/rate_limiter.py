@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+
+
+class RateLimiter(ABC):
+    """
+    Rate-limit backend used by `rate_limit_dependency`.
+
+    `rate_limit` records a request costing `cost` units for `key` and
+    returns whether it is within `limit` units per `window` seconds.
+    Backends differ in where the counters live: process memory, a
+    shared-memory table for all workers on one host, or a Redis server.
+
+    Backends that wait on file locks or the network set `performs_io` so
+    the async dependency runs them in the threadpool; in-process ones only
+    hold a lock for microseconds and are called directly.
+    """
+
+    performs_io = False
+
+    @abstractmethod
+    def rate_limit(self, key: str, limit: int, window: int, cost: int = 1) -> bool:
+        ...
+
+
+class AsyncRateLimiter(ABC):
+    """
+    Rate-limit backend awaited directly on the event loop.
+
+    Same contract as `RateLimiter`, for backends that never block the loop
+    thread.
+    """
+
+    @abstractmethod
+    async def rate_limit(self, key: str, limit: int, window: int, cost: int = 1) -> bool:
+        ...
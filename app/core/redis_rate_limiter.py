@@ -0,0 +1,154 @@
+import socket
+import threading
+import time
+from typing import Any, Callable, List, Sequence
+from urllib.parse import urlparse
+
+from app.core.rate_limiter import RateLimiter
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisClient:
+    """
+    Minimal Redis client speaking RESP over a plain socket.
+
+    Only what the rate limiter needs: pipelined commands and the basic
+    reply types. Each thread gets its own connection, opened on first use
+    and dropped after any socket error so the next call reconnects.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.local = threading.local()
+
+    @staticmethod
+    def _encode(command: Sequence[Any]) -> bytes:
+        parts = [f"*{len(command)}\r\n".encode()]
+        for arg in command:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b"".join(parts)
+
+    @classmethod
+    def _read_reply(cls, stream) -> Any:
+        line = stream.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by Redis")
+
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            return RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = stream.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [cls._read_reply(stream) for _ in range(length)]
+        raise RedisError(f"Unexpected reply {line!r}")
+
+    def _connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            connection = self.local.connection = (sock, sock.makefile("rb"))
+
+            setup = []
+            if self.password:
+                setup.append(("AUTH", self.password))
+            if self.db:
+                setup.append(("SELECT", self.db))
+            if setup:
+                self._send(connection, setup)
+        return connection
+
+    def _send(self, connection, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        sock, stream = connection
+        sock.sendall(b"".join(self._encode(command) for command in commands))
+        replies = [self._read_reply(stream) for _ in commands]
+
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def pipeline(self, *commands: Sequence[Any]) -> List[Any]:
+        """Send all commands in one round trip and return their replies in order."""
+        try:
+            return self._send(self._connection(), commands)
+        except OSError:
+            self.close()
+            raise
+
+    def execute(self, *command: Any) -> Any:
+        return self.pipeline(command)[0]
+
+    def close(self) -> None:
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            sock, stream = connection
+            stream.close()
+            sock.close()
+            self.local.connection = None
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Sliding-window-counter rate limiter on Redis, shared by every process
+    and host pointed at the same server.
+
+    Each key has one counter per fixed window (`<prefix><key>:<window>:<n>`)
+    that expires after two windows. A request adds its cost to the current
+    counter and reads the previous one in one pipelined round trip; the previous
+    count is weighted as in `SlidingWindowRateLimiter`, and a rejected
+    request is taken back so it doesn't count.
+
+    If Redis can't be reached the request is allowed (and counted in
+    `errors`): an outage of the limiter should not take the API down.
+    """
+
+    performs_io = True
+
+    def __init__(self, client: RedisClient, prefix: str = "rate_limit:", clock: Callable[[], float] = time.time):
+        self.client = client
+        self.prefix = prefix
+        self.clock = clock
+        self.errors = 0
+
+    def rate_limit(self, key: str, limit: int, window: int, cost: int = 1) -> bool:
+        now = self.clock()
+        index = int(now // window)
+        base = f"{self.prefix}{key}:{window}:"
+        current_key = f"{base}{index}"
+
+        try:
+            current, _, previous = self.client.pipeline(
+                ("INCRBY", current_key, cost),
+                ("EXPIRE", current_key, 2 * window),
+                ("GET", f"{base}{index - 1}"),
+            )
+            weight = (window - (now - index * window)) / window
+            if int(previous or 0) * weight + current <= limit:
+                return True
+
+            self.client.execute("DECRBY", current_key, cost)
+            return False
+        except (OSError, RedisError):
+            self.errors += 1
+            return True
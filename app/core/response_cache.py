@@ -0,0 +1,94 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.data_version import data_version
+
+
+class ResponseCache:
+    """
+    A bounded LRU cache of serialized responses.
+
+    Entries are stored as ready-to-send bytes together with the data version
+    they were rendered at. An entry is served only while it is younger than
+    `ttl` seconds and its version is still the current one, so any ORM write
+    to employee, company or department invalidates everything rendered
+    before it.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache: "OrderedDict[Hashable, Tuple[int, float, bytes]]" = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            version, expires_at, body = entry
+            if version != data_version.current or expires_at <= now:
+                del self.cache[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def has(self, key: Hashable) -> bool:
+        """Whether `get(key)` would hit now, without counting it or refreshing its LRU position."""
+        with self.lock:
+            entry = self.cache.get(key)
+        if entry is None:
+            return False
+
+        version, expires_at, _ = entry
+        return version == data_version.current and expires_at > time.monotonic()
+
+    def set(self, key: Hashable, body: bytes, version: int) -> None:
+        if version != data_version.current:
+            # Rendered from data that changed while the request ran
+            return
+
+        with self.lock:
+            self.cache[key] = (version, time.monotonic() + self.ttl, body)
+            self.cache.move_to_end(key)
+
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "entries": len(self.cache),
+                "max_entries": self.max_entries,
+                "bytes": sum(len(body) for _, _, body in self.cache.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    ttl=settings.response_cache_ttl,
+)
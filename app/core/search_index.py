@@ -0,0 +1,94 @@
+import re
+from typing import Optional
+
+from sqlalchemy import DDL, event, literal_column, select, table, text
+from sqlalchemy.engine import Connection
+
+from app.models.employee import Employee
+
+
+FTS_TABLE = "employee_fts"
+
+# External-content FTS5 table: the index stores only tokens and points back to
+# `employee.id` through the rowid, so the row data is not duplicated.
+FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        first_name,
+        last_name,
+        email,
+        content='employee',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON employee BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, first_name, last_name, email)
+        VALUES (new.id, new.first_name, new.last_name, new.email);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON employee BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, first_name, last_name, email)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF first_name, last_name, email ON employee BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, first_name, last_name, email)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+        INSERT INTO {FTS_TABLE}(rowid, first_name, last_name, email)
+        VALUES (new.id, new.first_name, new.last_name, new.email);
+    END
+    """,
+]
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+# Keep the index in sync for every database created through the metadata.
+for statement in FTS_DDL:
+    event.listen(Employee.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+
+def create_search_index(connection: Connection) -> None:
+    for statement in FTS_DDL:
+        connection.execute(text(statement))
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def build_match_query(search: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every token becomes a quoted prefix query and tokens are implicitly AND-ed,
+    so "jo smi" matches "John Smith". Returns None when the input has no
+    indexable tokens.
+    """
+    tokens = TOKEN_PATTERN.findall(search.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def search_ids(search: str):
+    """Select of the ids of the employees matching `search`, or None without tokens."""
+    match_query = build_match_query(search)
+    if match_query is None:
+        return None
+
+    return select(literal_column("rowid").label("id")).select_from(table(FTS_TABLE)).where(
+        text(f"{FTS_TABLE} MATCH :fts_query").bindparams(fts_query=match_query)
+    )
+
+
+def search_condition(search: str):
+    matching_ids = search_ids(search)
+    if matching_ids is None:
+        return None
+    return Employee.id.in_(matching_ids)
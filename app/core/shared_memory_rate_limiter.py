@@ -0,0 +1,108 @@
+import fcntl
+import mmap
+import os
+import struct
+import time
+from hashlib import blake2b
+from threading import Lock
+from typing import Callable, List
+
+from app.core.rate_limiter import RateLimiter
+from app.core.sliding_window_rate_limiter import slide
+
+
+# key hash (0 = free), window start, current count, previous count, window length, padding
+SLOT = struct.Struct("<QdIIII")
+
+
+class SharedMemoryRateLimiter(RateLimiter):
+    """
+    Sliding-window-counter rate limiter whose counters live in a memory-mapped
+    file, so every worker process on the host enforces the same limits.
+
+    The file is a fixed table of `slots` 32-byte slots split into `stripes`.
+    A key is hashed to a stripe and probed linearly inside it; the stripe's
+    byte range is held with `fcntl.lockf` (between processes) and a thread
+    lock (between threads of one process, which share `lockf` locks) while
+    its slot is updated. Slots idle for two windows are reused in place, and
+    when a stripe is full the least recently started slot is evicted, so the
+    table never grows.
+    """
+
+    performs_io = True
+
+    def __init__(
+        self,
+        path: str,
+        slots: int = 65_536,
+        stripes: int = 256,
+        max_probes: int = 16,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.stripes = stripes
+        self.slots_per_stripe = max(1, -(-slots // stripes))
+        self.max_probes = min(max_probes, self.slots_per_stripe)
+        self.clock = clock
+        self.thread_locks: List[Lock] = [Lock() for _ in range(stripes)]
+
+        size = self.stripes * self.slots_per_stripe * SLOT.size
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self.fd).st_size < size:
+                os.ftruncate(self.fd, size)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.table = mmap.mmap(self.fd, size)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+    def _find_slot(self, base: int, home: int, key_hash: int, now: float) -> int:
+        reusable = None
+        oldest, oldest_start = None, float("inf")
+
+        for probe in range(self.max_probes):
+            slot = base + (home + probe) % self.slots_per_stripe
+            slot_hash, start, _, _, window, _ = SLOT.unpack_from(self.table, slot * SLOT.size)
+            if slot_hash == key_hash:
+                return slot
+            if reusable is None and (slot_hash == 0 or now - start >= 2 * window):
+                reusable = slot
+            if start < oldest_start:
+                oldest, oldest_start = slot, start
+
+        return reusable if reusable is not None else oldest
+
+    def rate_limit(self, key: str, limit: int, window: int, cost: int = 1) -> bool:
+        key_hash = self._hash(key)
+        stripe = key_hash % self.stripes
+        base = stripe * self.slots_per_stripe
+        home = (key_hash // self.stripes) % self.slots_per_stripe
+        stripe_size = self.slots_per_stripe * SLOT.size
+
+        with self.thread_locks[stripe]:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, stripe_size, base * SLOT.size)
+            try:
+                now = self.clock()
+                slot = self._find_slot(base, home, key_hash, now)
+                offset = slot * SLOT.size
+
+                slot_hash, start, current, previous, slot_window, _ = SLOT.unpack_from(self.table, offset)
+                if slot_hash != key_hash or slot_window != window:
+                    start, current, previous = now, 0, 0
+
+                start, current, previous, used = slide(start, current, previous, window, now)
+                allowed = used + cost <= limit
+                if allowed:
+                    current += cost
+
+                SLOT.pack_into(self.table, offset, key_hash, start, current, previous, window, 0)
+                return allowed
+            finally:
+                fcntl.lockf(self.fd, fcntl.LOCK_UN, stripe_size, base * SLOT.size)
+
+    def close(self) -> None:
+        self.table.close()
+        os.close(self.fd)
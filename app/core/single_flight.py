@@ -0,0 +1,117 @@
+import asyncio
+from threading import Event, Lock
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is still in flight wait for it and receive the same result (or exception).
+    Nothing is kept once the call finishes, so results are never staler than
+    a fresh execution would have been.
+    """
+
+    def __init__(self):
+        self.calls: Dict[Hashable, _Call] = {}
+        self.lock = Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "in_flight": len(self.calls),
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+            }
+
+
+class AsyncSingleFlight:
+    """
+    Event-loop counterpart of `SingleFlight`.
+
+    Followers await the leader's future instead of blocking a thread. All
+    bookkeeping happens on the loop thread between awaits, so no lock is
+    needed.
+    """
+
+    def __init__(self):
+        self.calls: Dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self.calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Shield so a cancelled follower doesn't cancel the shared call
+            return await asyncio.shield(future)
+
+        future = self.calls[key] = asyncio.get_running_loop().create_future()
+        self.executions += 1
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark as retrieved: there may be no followers to consume it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self.calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self.calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
+
+
+listing_single_flight = SingleFlight()
+async_listing_single_flight = AsyncSingleFlight()
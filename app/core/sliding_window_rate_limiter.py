@@ -0,0 +1,135 @@
+import time
+from threading import Lock, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.rate_limiter import RateLimiter
+
+
+def slide(start: float, current: int, previous: int, window: float, now: float) -> Tuple[float, int, int, float]:
+    """
+    Advance a window counter to `now`.
+
+    Returns the new (start, current, previous) and the estimated number of
+    requests in the sliding window ending at `now`.
+    """
+    elapsed = now - start
+    if elapsed >= window:
+        # Roll forward; after two or more windows nothing carries over
+        windows_passed = int(elapsed // window)
+        previous = current if windows_passed == 1 else 0
+        current = 0
+        start += windows_passed * window
+        elapsed = now - start
+
+    weight = (window - elapsed) / window
+    return start, current, previous, previous * weight + current
+
+
+class _Window:
+    __slots__ = ("start", "current", "previous", "length")
+
+    def __init__(self, start: float, length: float):
+        self.start = start
+        self.current = 0
+        self.previous = 0
+        self.length = length
+
+
+class _Shard:
+    __slots__ = ("lock", "windows")
+
+    def __init__(self):
+        self.lock = Lock()
+        self.windows: Dict[str, _Window] = {}
+
+
+class SlidingWindowRateLimiter(RateLimiter):
+    """
+    Sliding-window-counter rate limiter with constant memory per key.
+
+    Each key keeps the number of requests allowed in the current fixed window
+    and in the previous one. A request is allowed while
+
+        previous * (share of the previous window still inside the sliding window) + current
+
+    plus the request's cost stays within the limit, which approximates a
+    true sliding log without storing timestamps. Rejected requests are not
+    counted.
+
+    Keys are spread over `shards` independently locked dicts, so concurrent
+    requests for different clients rarely contend. Keys idle for two windows
+    carry no state worth keeping; a background thread drops them every
+    `eviction_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        shards: int = 64,
+        eviction_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.clock = clock
+        self.shards: List[_Shard] = [_Shard() for _ in range(shards)]
+        self.eviction_interval = eviction_interval
+        self.evictions = 0
+        self._eviction_thread: Optional[Thread] = None
+        self._eviction_lock = Lock()
+
+    def _shard(self, key: str) -> _Shard:
+        return self.shards[hash(key) % len(self.shards)]
+
+    def rate_limit(self, key: str, limit: int, window: int, cost: int = 1) -> bool:
+        self._start_eviction()
+        now = self.clock()
+        shard = self._shard(key)
+
+        with shard.lock:
+            state = shard.windows.get(key)
+            if state is None or state.length != window:
+                state = shard.windows[key] = _Window(now, window)
+
+            state.start, state.current, state.previous, used = slide(
+                state.start, state.current, state.previous, window, now,
+            )
+            if used + cost > limit:
+                return False
+
+            state.current += cost
+            return True
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Drop keys whose last two windows are over; returns how many were dropped."""
+        now = self.clock() if now is None else now
+        evicted = 0
+
+        for shard in self.shards:
+            with shard.lock:
+                idle = [
+                    key for key, state in shard.windows.items()
+                    if now - state.start >= 2 * state.length
+                ]
+                for key in idle:
+                    del shard.windows[key]
+            evicted += len(idle)
+
+        self.evictions += evicted
+        return evicted
+
+    def __len__(self) -> int:
+        return sum(len(shard.windows) for shard in self.shards)
+
+    def _start_eviction(self) -> None:
+        if self._eviction_thread is not None:
+            return
+
+        with self._eviction_lock:
+            if self._eviction_thread is not None:
+                return
+
+            def evict_forever():
+                while True:
+                    time.sleep(self.eviction_interval)
+                    self.evict_idle()
+
+            self._eviction_thread = Thread(target=evict_forever, name="rate-limit-eviction", daemon=True)
+            self._eviction_thread.start()
@@ -0,0 +1,86 @@
+import time
+from threading import Lock
+from typing import Dict, Tuple
+
+from sqlalchemy import DDL, event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session, SQLModel, select
+
+from app.core.config import settings
+from app.models.employee import Employee
+from app.models.organisation_settings import OrganisationSettings
+from app.models.table_version import TableVersion
+
+
+# Tables whose in-memory copies must notice writes from any process
+VERSIONED_TABLES = (Employee.__tablename__, OrganisationSettings.__tablename__)
+
+_BUMP = """
+    INSERT INTO table_version(name, version) VALUES ('{table}', 1)
+    ON CONFLICT(name) DO UPDATE SET version = version + 1;
+"""
+
+# Triggers see every write, whether it comes from this process's ORM, another
+# uvicorn worker, a task such as set_up_data or raw SQL.
+TABLE_VERSION_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS table_version_{table}_{suffix} AFTER {operation} ON {table} BEGIN
+        {_BUMP.format(table=table)}
+    END
+    """
+    for table in VERSIONED_TABLES
+    for suffix, operation in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE"))
+]
+
+
+# Run after every create_all, so databases created before the counters
+# existed get their triggers at the next startup.
+for statement in TABLE_VERSION_DDL:
+    event.listen(SQLModel.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+
+def create_version_triggers(connection: Connection) -> None:
+    for statement in TABLE_VERSION_DDL:
+        connection.execute(text(statement))
+
+
+class TableVersions:
+    """
+    Cached reads of the trigger-maintained `table_version` counters.
+
+    An in-memory copy records the counter it was loaded at (`read()`, in the
+    same transaction as its load) and compares it with `current()`. The
+    counter is re-read at most every `interval` seconds per database, so a
+    request pays at most one primary key lookup per interval to notice
+    writes made outside this process.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.cache: Dict[Tuple[Engine, str], Tuple[float, int]] = {}
+        self.lock = Lock()
+
+    def read(self, session: Session, name: str) -> int:
+        """The counter as seen by `session`'s transaction, bypassing the cache."""
+        version = session.exec(select(TableVersion.version).where(TableVersion.name == name)).first() or 0
+
+        key = (session.get_bind(), name)
+        with self.lock:
+            _, cached = self.cache.get(key, (0.0, 0))
+            # Counters only grow; an older snapshot must not roll the cache back
+            self.cache[key] = (time.monotonic(), max(version, cached))
+        return version
+
+    def current(self, session: Session, name: str) -> int:
+        """The counter as last read, re-read through `session` once the read is older than `interval`."""
+        with self.lock:
+            entry = self.cache.get((session.get_bind(), name))
+        if entry is not None and time.monotonic() - entry[0] < self.interval:
+            return entry[1]
+
+        self.read(session, name)
+        with self.lock:
+            return self.cache[(session.get_bind(), name)][1]
+
+
+table_versions = TableVersions(interval=settings.table_version_check_interval)
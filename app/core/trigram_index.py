@@ -0,0 +1,133 @@
+import re
+import time
+from collections import Counter
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.data_version import data_version
+from app.core.table_versions import table_versions
+from app.models.employee import Employee
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(term: str) -> Set[str]:
+    # Padded like pg_trgm so that short terms and word starts get trigrams too
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Trigram posting lists over the vocabulary of employee first and last names.
+
+    Each distinct lower-cased name is a term; every trigram maps to the
+    terms containing it. A misspelled token is resolved by counting shared
+    trigrams along its own posting lists and scoring candidates by their
+    Dice coefficient (2 * shared / (trigrams of token + trigrams of name),
+    which is kinder than Jaccard to transposed letters in short names), so
+    the work depends on the number of distinct names, not on the number of
+    employees. The matching terms are returned with the spellings stored in
+    the table, ready for indexed `IN (...)` lookups.
+
+    The vocabulary is a snapshot, reloaded once it is older than `ttl`
+    seconds and employees were written since: through the ORM in this
+    process, or anywhere else according to the trigger-maintained
+    `table_version` counter. Until then a newly added name is only found by
+    the standard search.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.terms: List[str] = []
+        self.spellings: List[Tuple[str, ...]] = []
+        self.trigram_counts: List[int] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.version: Optional[int] = None
+        self.table_version = 0
+        self.loaded_at: Optional[float] = None
+        self.lock = Lock()
+
+    def is_stale(self, session: Session) -> bool:
+        if self.loaded_at is None:
+            return True
+        if time.monotonic() - self.loaded_at <= self.ttl:
+            return False
+        return (
+            self.version != data_version.current
+            or table_versions.current(session, Employee.__tablename__) > self.table_version
+        )
+
+    def load(self, session: Session) -> None:
+        version = data_version.current
+        table_version = table_versions.read(session, Employee.__tablename__)
+        spellings: Dict[str, Set[str]] = {}
+        for column in (Employee.first_name, Employee.last_name):
+            for value in session.exec(select(column).distinct()):
+                if value:
+                    spellings.setdefault(value.lower(), set()).add(value)
+
+        terms = sorted(spellings)
+        postings: Dict[str, List[int]] = {}
+        trigram_counts = []
+        for term_id, term in enumerate(terms):
+            term_trigrams = trigrams(term)
+            trigram_counts.append(len(term_trigrams))
+            for trigram in term_trigrams:
+                postings.setdefault(trigram, []).append(term_id)
+
+        with self.lock:
+            self.terms = terms
+            self.spellings = [tuple(sorted(spellings[term])) for term in terms]
+            self.trigram_counts = trigram_counts
+            self.postings = postings
+            self.version = version
+            self.table_version = table_version
+            self.loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.loaded_at = None
+
+    def refresh_if_stale(self, session: Session) -> None:
+        if self.is_stale(session):
+            self.load(session)
+
+    def similar(self, token: str, threshold: float, limit: int) -> Dict[str, float]:
+        """
+        Stored spellings of the names most similar to `token`, with their
+        similarity in (0, 1], keeping at most `limit` names at or above
+        `threshold`.
+        """
+        with self.lock:
+            terms, spellings = self.terms, self.spellings
+            trigram_counts, postings = self.trigram_counts, self.postings
+
+        token_trigrams = trigrams(token.lower())
+        shared = Counter()
+        for trigram in token_trigrams:
+            shared.update(postings.get(trigram, ()))
+
+        scored = []
+        for term_id, count in shared.items():
+            similarity = 2 * count / (len(token_trigrams) + trigram_counts[term_id])
+            if similarity >= threshold:
+                scored.append((similarity, terms[term_id], term_id))
+        scored.sort(key=lambda match: (-match[0], match[1]))
+
+        return {
+            spelling: round(similarity, 4)
+            for similarity, _, term_id in scored[:limit]
+            for spelling in spellings[term_id]
+        }
+
+
+trigram_index = TrigramIndex(ttl=settings.fuzzy_vocabulary_ttl)
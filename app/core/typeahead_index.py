@@ -0,0 +1,271 @@
+import heapq
+import string
+from array import array
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func, literal, union_all
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from app.core.background_refresh import BackgroundRefresh
+from app.core.data_version import track_changes
+from app.core.single_flight import SingleFlight
+from app.core.table_versions import table_versions
+from app.models.employee import Employee
+
+
+class Suggestion(NamedTuple):
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+
+
+# SQLite's lower() only folds ASCII, and the keys are folded by SQLite on load
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+# Never part of UTF-8, so `prefix + _PAST_PREFIX` sorts after every completion of prefix
+_PAST_PREFIX = b"\xff"
+
+
+class _SortedKeys:
+    """Indexable view of the distinct keys packed into one UTF-8 blob, for `bisect`."""
+
+    def __init__(self, blob: bytes, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position: int) -> bytes:
+        return self.blob[self.offsets[position]:self.offsets[position + 1]]
+
+
+class TypeaheadIndex:
+    """
+    Sorted prefix index over employee names and emails.
+
+    Every employee contributes its lower-cased first name, last name,
+    "first last" and email as keys. SQLite sorts the keys on load;
+    the distinct keys are packed into one UTF-8 blob with an offset
+    array, and the ids under each key into one id array, so memory stays
+    within a few dozen bytes per key instead of a Python tuple per key. All
+    keys starting with a prefix form a contiguous range found with two
+    bisections. Matches are ordered by key, which puts exact matches before
+    longer completions; only the matched rows are then read by primary key.
+
+    A cold index is loaded once, however many requests arrive while it
+    loads. ORM writes to employees mark the touched ids once their
+    transaction commits; the next lookup re-reads only those rows into a
+    small delta that overrides the arrays. Once the delta outgrows
+    `max_delta` the arrays are rebuilt on a background thread. A bulk
+    statement drops the index for a full reload. Writes from other workers,
+    tasks or raw SQL are not seen per row: they advance the
+    trigger-maintained `table_version` counter, checked at most every
+    TABLE_VERSION_CHECK_INTERVAL seconds, and the arrays are then rebuilt in
+    the background while the current ones keep serving.
+    """
+
+    def __init__(self, max_delta: int = 10_000):
+        self.max_delta = max_delta
+        self.keys = _SortedKeys(b"", np.zeros(1, dtype=np.int64))
+        # ids[postings[k]:postings[k + 1]] are the employees under key k
+        self.postings = np.zeros(1, dtype=np.int64)
+        self.ids = np.empty(0, dtype=np.int64)
+        # employee id -> its keys (none once deleted), overriding the arrays
+        self.delta: Dict[int, List[bytes]] = {}
+        self.delta_keys: List[Tuple[bytes, int]] = []
+        self.loaded = False
+        self.table_version = 0
+        self.generation = 0
+        self.changed: Set[int] = set()
+        self.lock = Lock()
+        self.loads = SingleFlight()
+        self.engine: Optional[Engine] = None
+        self.refresher = BackgroundRefresh("typeahead-index-refresh")
+
+    @staticmethod
+    def _fold(text: str) -> bytes:
+        return text.translate(_ASCII_LOWER).encode()
+
+    @classmethod
+    def _keys_of(cls, first_name: str, last_name: str, email: str) -> List[bytes]:
+        first_name, last_name = cls._fold(first_name), cls._fold(last_name)
+        return sorted({first_name, last_name, first_name + b" " + last_name, cls._fold(email)})
+
+    @staticmethod
+    def _key_query():
+        first_name, last_name = func.lower(Employee.first_name), func.lower(Employee.last_name)
+        keyed = union_all(
+            select(first_name.label("key"), Employee.id),
+            select(last_name.label("key"), Employee.id),
+            select((first_name + literal(" ") + last_name).label("key"), Employee.id),
+            select(func.lower(Employee.email).label("key"), Employee.id),
+        ).subquery()
+        return select(keyed.c.key, keyed.c.id).order_by(keyed.c.key, keyed.c.id)
+
+    def load(self, session: Session, batch_size: int = 100_000) -> None:
+        with self.lock:
+            generation = self.generation
+            # Changes marked or in the delta so far were committed before this snapshot
+            applied = dict(self.delta)
+            pending = set(self.changed)
+
+        # Read in the same transaction as the keys, so it matches the snapshot
+        table_version = table_versions.read(session, Employee.__tablename__)
+
+        # Built in flat int64 arrays, so a large load never holds an object per key
+        blob = bytearray()
+        offsets = array("q", [0])
+        postings = array("q")
+        ids = array("q")
+        previous = None
+
+        result = session.exec(self._key_query().execution_options(yield_per=batch_size))
+        for key, employee_id in result:
+            if key != previous:
+                blob += key.encode()
+                offsets.append(len(blob))
+                postings.append(len(ids))
+                previous = key
+            elif employee_id == ids[-1]:
+                # The same key twice for one employee, e.g. equal first and last names
+                continue
+            ids.append(employee_id)
+        postings.append(len(ids))
+
+        keys = _SortedKeys(bytes(blob), np.frombuffer(offsets, dtype=np.int64))
+        postings_array = np.frombuffer(postings, dtype=np.int64)
+        ids_array = np.frombuffer(ids, dtype=np.int64)
+
+        with self.lock:
+            self.keys, self.postings, self.ids = keys, postings_array, ids_array
+            self.delta = {
+                employee_id: employee_keys
+                for employee_id, employee_keys in self.delta.items()
+                if applied.get(employee_id) is not employee_keys
+            }
+            self.delta_keys = self._sort_delta(self.delta)
+            self.changed -= pending
+            self.table_version = table_version
+            # A bulk write during the load may not be in the snapshot
+            self.loaded = self.generation == generation
+            self.engine = session.get_bind()
+
+    def ensure_loaded(self, session: Session) -> None:
+        """Load a cold index; concurrent callers wait for the one load in flight."""
+        if not self.loaded:
+            self.loads.do("load", lambda: self.load(session))
+
+    def refresh_in_background(self) -> None:
+        """Rebuild the arrays from a fresh session on a worker thread; at most one rebuild runs at a time."""
+        engine = self.engine
+        if not self.loaded or engine is None:
+            return
+
+        def reload():
+            with Session(engine) as session:
+                self.loads.do("load", lambda: self.load(session))
+
+        self.refresher.start(reload)
+
+    def mark_changed(self, employee_ids: Iterable[int]) -> None:
+        with self.lock:
+            self.changed.update(employee_ids)
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.loaded = False
+            self.generation += 1
+            self.delta, self.delta_keys = {}, []
+            self.changed.clear()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.keys = _SortedKeys(b"", np.zeros(1, dtype=np.int64))
+            self.postings = np.zeros(1, dtype=np.int64)
+            self.ids = np.empty(0, dtype=np.int64)
+            self.loaded = False
+            self.generation += 1
+            self.delta, self.delta_keys = {}, []
+            self.changed.clear()
+
+    @staticmethod
+    def _sort_delta(delta: Dict[int, List[bytes]]) -> List[Tuple[bytes, int]]:
+        return sorted((key, employee_id) for employee_id, keys in delta.items() for key in keys)
+
+    def _refresh(self, session: Session) -> None:
+        with self.lock:
+            employee_ids, self.changed = self.changed, set()
+
+        rows = session.exec(
+            select(Employee.id, Employee.first_name, Employee.last_name, Employee.email)
+            .where(Employee.id.in_(employee_ids))
+        ).all()
+        # Ids without a row were deleted; a fresh (empty) list masks their old keys
+        changes = {employee_id: [] for employee_id in employee_ids}
+        for employee_id, first_name, last_name, email in rows:
+            changes[employee_id] = self._keys_of(first_name, last_name, email)
+
+        with self.lock:
+            # Replaced, not mutated, so lookups holding the old delta stay consistent
+            self.delta = {**self.delta, **changes}
+            self.delta_keys = self._sort_delta(self.delta)
+            overflow = len(self.delta) > self.max_delta
+
+        if overflow:
+            self.refresh_in_background()
+
+    def _matches(self, prefix: bytes) -> Iterator[Tuple[bytes, int]]:
+        with self.lock:
+            keys, postings, ids = self.keys, self.postings, self.ids
+            delta, delta_keys = self.delta, self.delta_keys
+
+        def indexed():
+            start, end = bisect_left(keys, prefix), bisect_left(keys, prefix + _PAST_PREFIX)
+            for position in range(start, end):
+                key = keys[position]
+                for employee_id in ids[postings[position]:postings[position + 1]].tolist():
+                    if employee_id not in delta:
+                        yield key, employee_id
+
+        start, end = bisect_left(delta_keys, (prefix,)), bisect_left(delta_keys, (prefix + _PAST_PREFIX,))
+        return heapq.merge(indexed(), delta_keys[start:end])
+
+    def suggest(self, session: Session, prefix: str, limit: int) -> List[Suggestion]:
+        self.ensure_loaded(session)
+        if self.changed:
+            self._refresh(session)
+        if table_versions.current(session, Employee.__tablename__) > self.table_version:
+            # Written by another process: serve the current arrays meanwhile
+            self.refresh_in_background()
+
+        prefix = self._fold(prefix.strip())
+        if not prefix:
+            return []
+
+        employee_ids: List[int] = []
+        for _, employee_id in self._matches(prefix):
+            if len(employee_ids) == limit:
+                break
+            if employee_id not in employee_ids:
+                employee_ids.append(employee_id)
+
+        if not employee_ids:
+            return []
+
+        rows = session.exec(
+            select(Employee.id, Employee.first_name, Employee.last_name, Employee.email)
+            .where(Employee.id.in_(employee_ids))
+        ).all()
+        suggestions = {row[0]: Suggestion(*row) for row in rows}
+        return [suggestions[employee_id] for employee_id in employee_ids if employee_id in suggestions]
+
+
+typeahead_index = TypeaheadIndex()
+
+
+track_changes(Employee, on_commit=typeahead_index.mark_changed, on_bulk=typeahead_index.invalidate)
@@ -1,7 +1,12 @@
 from fastapi import FastAPI
+from sqlmodel import Session
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import engine, init_db
+from app.core.filter_index import filter_index
+from app.core.organisation_settings import organisation_settings_store
+from app.core.typeahead_index import typeahead_index
+from app.operations.counting import employee_statistics
 from app.api.router import api_router
 
 
@@ -15,6 +20,23 @@ app = FastAPI(
 def on_startup():
     init_db()
 
+    with Session(engine) as session:
+        organisation_settings_store.load(session)
+
+    if settings.filter_index_enabled:
+        with Session(engine) as session:
+            filter_index.load(session)
+
+    # Estimated totals and request costs read the statistics; load them
+    # before the first request rather than on it
+    if settings.count_strategy == "estimate" or settings.rate_limit_costs_enabled:
+        with Session(engine) as session:
+            employee_statistics.load(session)
+
+    if settings.typeahead_preload:
+        with Session(engine) as session:
+            typeahead_index.load(session)
+
 
 app.include_router(api_router, prefix=settings.api_v1_prefix)
 
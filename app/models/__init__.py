@@ -3,6 +3,8 @@ from app.models.organisation_settings import OrganisationSettings
 from app.models.company import Company
 from app.models.department import Department
 from app.models.employee import Employee
+from app.models.employee_facet_count import EmployeeFacetCount
+from app.models.table_version import TableVersion
 
 
 __all__ = [
@@ -11,5 +13,7 @@ __all__ = [
     "Company",
     "Department",
     "Employee",
+    "EmployeeFacetCount",
+    "TableVersion",
 ]
 
@@ -1,8 +1,11 @@
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, SQLModel, UniqueConstraint
 from typing import Optional
 
 
 class Company(SQLModel, table=True):
+    # Natural key used by the reference-data loaders to upsert
+    __table_args__ = (UniqueConstraint("organisation_id", "name"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True)
     organisation_id: int = Field(foreign_key="organisation.id", index=True)
@@ -1,8 +1,11 @@
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, SQLModel, UniqueConstraint
 from typing import Optional
 
 
 class Department(SQLModel, table=True):
+    # Natural key used by the reference-data loaders to upsert
+    __table_args__ = (UniqueConstraint("company_id", "name"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True)
     company_id: int = Field(foreign_key="company.id", index=True)
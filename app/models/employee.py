@@ -1,5 +1,5 @@
 from enum import Enum
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 from typing import Optional
 
 
@@ -10,15 +10,32 @@ class EmployeeStatus(str, Enum):
 
 
 class Employee(SQLModel, table=True):
+    # Composite indexes for the common listing filter combinations; their
+    # prefixes also serve filters on company_id, organisation_id or status
+    # alone. A scan of one index range returns rows in id order only when
+    # every column before id is bound to a single value, e.g. one company and
+    # one status; with IN lists SQLite either merges the ranges through a
+    # temporary B-tree or walks the primary key and filters.
+    # `python -m app.tasks.explain_queries` shows which queries use them.
+    __table_args__ = (
+        Index("ix_employee_company_id_status_id", "company_id", "status", "id"),
+        Index("ix_employee_organisation_id_department_id", "organisation_id", "department_id"),
+        Index("ix_employee_status_location", "status", "location"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     first_name: str = Field(index=True)
     last_name: str = Field(index=True)
     email: str = Field(index=True, unique=True)
     phone_number: Optional[str] = None
-    status: EmployeeStatus = Field(index=True)
+    status: EmployeeStatus
     department_id: Optional[int] = Field(default=None, foreign_key="department.id", index=True)
-    company_id: int = Field(foreign_key="company.id", index=True)
-    organisation_id: int = Field(foreign_key="organisation.id", index=True)
+    company_id: int = Field(foreign_key="company.id")
+    organisation_id: int = Field(foreign_key="organisation.id")
     position: Optional[str] = Field(index=True)
     location: Optional[str] = Field(index=True)
+    # Denormalized from company / department, kept in sync by triggers
+    # (see app.core.employee_names)
+    company_name: Optional[str] = None
+    department_name: Optional[str] = None
 
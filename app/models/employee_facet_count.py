@@ -0,0 +1,25 @@
+from sqlmodel import Field, SQLModel, UniqueConstraint
+from typing import Optional
+
+from app.models.employee import EmployeeStatus
+
+
+class EmployeeFacetCount(SQLModel, table=True):
+    """
+    Employee counts per combination of the listing filter dimensions.
+
+    Maintained by triggers on `employee`. NULL dimensions are stored as
+    0 / '' so that they take part in the unique key used for upserts.
+    """
+    __tablename__ = "employee_facet_count"
+    __table_args__ = (
+        UniqueConstraint("status", "company_id", "department_id", "position", "location"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    status: EmployeeStatus
+    company_id: int = Field(index=True)
+    department_id: int = 0
+    position: str = ""
+    location: str = ""
+    count: int = 0
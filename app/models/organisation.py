@@ -4,5 +4,5 @@ from typing import Optional
 
 class Organisation(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    name: str = Field(index=True)
+    name: str = Field(index=True, unique=True)
 
@@ -4,6 +4,6 @@ from typing import Optional, Dict, Any
 
 class OrganisationSettings(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    organisation_id: int = Field(foreign_key="organisation.id", index=True)
+    organisation_id: int = Field(foreign_key="organisation.id", index=True, unique=True)
     settings: Dict[str, Any] = Field(sa_column=Column(JSON))
 
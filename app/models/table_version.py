@@ -0,0 +1,12 @@
+from sqlmodel import Field, SQLModel
+
+
+class TableVersion(SQLModel, table=True):
+    """
+    Write counter of one table, bumped by triggers for every row inserted,
+    updated or deleted (see app.core.table_versions).
+    """
+    __tablename__ = "table_version"
+
+    name: str = Field(primary_key=True)
+    version: int = 0
@@ -0,0 +1,51 @@
+from typing import Optional
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.operations.counting import employee_statistics
+from app.schemas.employee import ListEmployeeFilters, SearchMode
+
+
+def estimate_request_cost(filters: ListEmployeeFilters, session: Optional[Session] = None) -> int:
+    """
+    Rate-limit units a listing-shaped request is charged, as a rough
+    measure of the database work it causes:
+
+    - 1 for the request itself
+    - RATE_LIMIT_COST_SEARCH for a search (LIKE scans the table), plus the
+      same again for fuzzy mode
+    - 1 per RATE_LIMIT_COST_OFFSET_ROWS rows skipped by OFFSET (cursor pages
+      seek and skip nothing)
+    - 1 per RATE_LIMIT_COST_PAGE_ROWS rows in the page
+    - 1 per RATE_LIMIT_COST_MATCHED_ROWS rows the filters match, from the
+      cached per-dimension statistics whatever the count strategy. No query
+      is run to price a request: missing or stale statistics are reloaded in
+      the background from `session`'s engine, and the term is skipped until
+      they were first loaded.
+
+    Always 1 when RATE_LIMIT_COSTS_ENABLED is off.
+    """
+    if not settings.rate_limit_costs_enabled:
+        return 1
+
+    cost = 1
+
+    if filters.search:
+        cost += settings.rate_limit_cost_search
+        if filters.search_mode == SearchMode.FUZZY:
+            cost += settings.rate_limit_cost_search
+
+    if not filters.cursor:
+        cost += (filters.page - 1) * filters.page_size // settings.rate_limit_cost_offset_rows
+
+    cost += filters.page_size // settings.rate_limit_cost_page_rows
+
+    if session is not None and employee_statistics.is_stale():
+        employee_statistics.refresh_in_background(session.get_bind())
+
+    matched = employee_statistics.estimate_cached(filters)
+    if matched is not None:
+        cost += matched // settings.rate_limit_cost_matched_rows
+
+    return cost
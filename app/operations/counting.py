@@ -0,0 +1,176 @@
+import time
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select, func
+
+from app.core.config import settings
+from app.core.background_refresh import BackgroundRefresh
+from app.core.data_version import data_version
+from app.core.single_flight import SingleFlight
+from app.models.employee import Employee
+from app.schemas.employee import FILTER_COLUMNS, ListEmployeeFilters
+from app.schemas.pagination import CountStrategy
+
+
+class CountCache:
+    """
+    Memoizes COUNT results per normalized filter set.
+
+    Entries expire after `ttl` seconds and the whole cache is dropped as soon
+    as the data version changes, so a write is never hidden for longer than
+    it takes the next request to notice the new version.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache: Dict[Hashable, Tuple[float, int]] = {}
+        self.version = data_version.current
+        self.lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        now = time.monotonic()
+
+        with self.lock:
+            if self.version != data_version.current:
+                self.cache.clear()
+                self.version = data_version.current
+                return None
+
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+
+            expires_at, total = entry
+            if expires_at <= now:
+                del self.cache[key]
+                return None
+
+            return total
+
+    def set(self, key: Hashable, total: int, version: int) -> None:
+        with self.lock:
+            if version != self.version:
+                # Counted against data that has since changed
+                return
+
+            if len(self.cache) >= self.max_entries:
+                # Dicts keep insertion order, so this drops the oldest entry
+                self.cache.pop(next(iter(self.cache)))
+
+            self.cache[key] = (time.monotonic() + self.ttl, total)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.cache.clear()
+
+
+class EmployeeStatistics:
+    """
+    Per-dimension row counts used to estimate filtered totals.
+
+    Counts are loaded with one COUNT and one GROUP BY per dimension, at
+    startup or by the first request that needs them (concurrent requests
+    share that load). Once loaded, estimates come from the last snapshot and
+    a snapshot older than `ttl` seconds is reloaded on a background thread,
+    so no request pays for the full-table scans again. Estimates assume the
+    dimensions are independent.
+    """
+
+    DIMENSIONS = FILTER_COLUMNS
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.total = 0
+        self.counts: Dict[str, Dict[Any, int]] = {}
+        self.loaded_at: Optional[float] = None
+        self.lock = Lock()
+        self.loads = SingleFlight()
+        self.refresher = BackgroundRefresh("employee-statistics-refresh")
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.loaded_at = None
+
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl
+
+    def load(self, session: Session) -> None:
+        total = session.exec(select(func.count(Employee.id))).one()
+        counts = {}
+        for name, column in self.DIMENSIONS.items():
+            rows = session.exec(select(column, func.count(Employee.id)).group_by(column)).all()
+            counts[name] = {value: row_count for value, row_count in rows}
+
+        with self.lock:
+            self.total = total
+            self.counts = counts
+            self.loaded_at = time.monotonic()
+
+    def refresh_in_background(self, engine: Engine) -> None:
+        """Reload from a fresh session on a worker thread; at most one reload runs at a time."""
+        def reload():
+            with Session(engine) as session:
+                self.load(session)
+
+        self.refresher.start(reload)
+
+    def estimate(self, session: Session, filters: ListEmployeeFilters) -> int:
+        if self.loaded_at is None:
+            self.loads.do("load", lambda: self.load(session))
+        elif self.is_stale():
+            self.refresh_in_background(session.get_bind())
+        return self.estimate_cached(filters)
+
+    def estimate_cached(self, filters: ListEmployeeFilters) -> Optional[int]:
+        """Estimate from the statistics as last loaded, without querying; None if never loaded."""
+        with self.lock:
+            total, counts = self.total, self.counts
+
+        if not counts:
+            return None
+        if total == 0:
+            return 0
+
+        estimate = float(total)
+        for name in self.DIMENSIONS:
+            values = filters.filter_values(name)
+            if values:
+                matched = sum(counts[name].get(value, 0) for value in values)
+                estimate *= matched / total
+
+        return round(estimate)
+
+
+count_cache = CountCache(ttl=settings.count_cache_ttl, max_entries=settings.count_cache_max_entries)
+employee_statistics = EmployeeStatistics(ttl=settings.count_statistics_ttl)
+
+
+def count_employees(
+    session: Session,
+    filters: ListEmployeeFilters,
+    count_query,
+) -> Tuple[int, bool]:
+    """
+    Resolve the total for a listing with the requested count strategy.
+
+    Returns the total and whether it is an estimate. Searches can't be
+    estimated from per-dimension statistics, so they are counted exactly.
+    """
+    strategy = CountStrategy(filters.count_strategy or settings.count_strategy)
+
+    if strategy == CountStrategy.ESTIMATE and not filters.search:
+        return employee_statistics.estimate(session, filters), True
+
+    if strategy == CountStrategy.CACHED:
+        key = filters.filter_key()
+        total = count_cache.get(key)
+        if total is None:
+            version = data_version.current
+            total = session.exec(count_query).one()
+            count_cache.set(key, total, version)
+        return total, False
+
+    return session.exec(count_query).one(), False
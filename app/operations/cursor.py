@@ -0,0 +1,59 @@
+import base64
+import binascii
+import json
+import math
+from typing import Any, NamedTuple
+
+from app.schemas.employee import SortOrder
+
+
+# SQLite integers are signed 64-bit
+MIN_ID = -(2 ** 63)
+MAX_ID = 2 ** 63 - 1
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+class Cursor(NamedTuple):
+    """Position of the last row of a page: its sort key and its id."""
+    sort: str
+    key: Any
+    id: int
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    payload = json.dumps([cursor.sort, cursor.key, cursor.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(value: str) -> Cursor:
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        sort, key, last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursorError("Invalid cursor")
+
+    if not _is_id(last_id) or not _is_valid_key(sort, key):
+        raise InvalidCursorError("Invalid cursor")
+
+    return Cursor(sort=sort, key=key, id=last_id)
+
+
+def _is_id(value: Any) -> bool:
+    # bool is an int subclass; a tampered `true` must not pass as id 1
+    return isinstance(value, int) and not isinstance(value, bool) and MIN_ID <= value <= MAX_ID
+
+
+def _is_valid_key(sort: Any, key: Any) -> bool:
+    """Whether `key` has the type the database compares the `sort` column with."""
+    if sort == SortOrder.ID.value:
+        return _is_id(key)
+    if sort in (SortOrder.LAST_NAME.value, SortOrder.FIRST_NAME.value):
+        return isinstance(key, str)
+    if sort == SortOrder.RELEVANCE.value:
+        if isinstance(key, int) and not isinstance(key, bool):
+            return MIN_ID <= key <= MAX_ID
+        return isinstance(key, float) and math.isfinite(key)
+    return False
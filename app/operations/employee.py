@@ -1,62 +1,497 @@
-from sqlmodel import Session, select, func, or_
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+
+from sqlmodel import Session, select, func, or_, and_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import case, intersect, literal, union, union_all
 from sqlalchemy import func as sql_func
-from typing import List, Tuple
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.filter_index import filter_index
+from app.core.organisation_settings import organisation_settings_store
+from app.core import employee_names  # registers the triggers that fill company/department names
+from app.core.search_index import search_condition as fts_search_condition
+from app.core.search_index import search_ids as fts_search_ids
+from app.core.trigram_index import tokenize, trigram_index
+from app.models.employee import Employee, EmployeeStatus
+from app.operations.counting import count_employees
+from app.operations.cursor import Cursor, InvalidCursorError, decode_cursor, encode_cursor
+from app.schemas.employee import ListEmployeeFilters, SearchMode, SortOrder
+
+
+# Always listed, whatever an organisation chooses to display
+IDENTITY_COLUMNS = ("id", "first_name", "last_name", "email", "status")
+
+# Columns an organisation can pick through `employee_display_columns`
+DISPLAY_COLUMNS = ("phone_number", "company_name", "department_name", "position", "location")
+
+# Indexed name column behind each name sort (SQLite appends the id to
+# every index entry, so the index also yields (name, id) order)
+SORT_COLUMNS = {
+    SortOrder.LAST_NAME: Employee.last_name,
+    SortOrder.FIRST_NAME: Employee.first_name,
+}
+
+# Most (company, status) pairs an id-ordered page is merged from; see
+# `_merged_id_ranges`
+MAX_MERGED_RANGES = 16
+
+# Runs the count query of parallel listings on its own pooled connection
+query_executor = ThreadPoolExecutor(
+    max_workers=settings.query_executor_workers,
+    thread_name_prefix="listing-count",
+)
+
+
+class EmployeePage(NamedTuple):
+    total: int
+    employees: List[Employee]
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
+
+
+def get_search_condition(search: str):
+    if settings.search_backend == "fts":
+        condition = fts_search_condition(search)
+        if condition is not None:
+            return condition
+
+    search_pattern = f"%{search}%"
+    return or_(
+        sql_func.lower(Employee.first_name).like(sql_func.lower(search_pattern)),
+        sql_func.lower(Employee.last_name).like(sql_func.lower(search_pattern)),
+        sql_func.lower(Employee.email).like(sql_func.lower(search_pattern))
+    )
+
+
+def get_relevance(search: str):
+    """
+    Relevance of a row to a search, computed in SQL: 3 when a first name,
+    last name, full name or email equals the search, 2 when one starts with
+    it, 1 when one contains it, 0 otherwise (e.g. FTS token matches).
+    """
+    term = search.strip().lower()
+    fields = (
+        sql_func.lower(Employee.first_name),
+        sql_func.lower(Employee.last_name),
+        sql_func.lower(Employee.first_name + " " + Employee.last_name),
+        sql_func.lower(Employee.email),
+    )
+    return case(
+        (or_(*(field == term for field in fields)), 3),
+        (or_(*(field.like(f"{term}%") for field in fields)), 2),
+        (or_(*(field.like(f"%{term}%") for field in fields)), 1),
+        else_=0,
+    )
+
+
+class FuzzySearch(NamedTuple):
+    condition: Any
+    # Sum over the search tokens of the best name similarity, 0 for rows
+    # matched by the standard search only
+    rank: Any
+
+
+def get_search_ids(search: str):
+    """
+    Ids matching the standard search as a compound select whose arms each
+    read one index: the FTS index, or one name/email index per LIKE arm
+    (still a scan of that index, but not of the table).
+    """
+    if settings.search_backend == "fts":
+        matching_ids = fts_search_ids(search)
+        if matching_ids is not None:
+            return matching_ids
+
+    search_pattern = f"%{search}%".lower()
+    return union(*(
+        select(Employee.id).where(sql_func.lower(column).like(search_pattern))
+        for column in (Employee.first_name, Employee.last_name, Employee.email)
+    ))
+
+
+def _ids_of(compound) -> Any:
+    # SQLite can't nest compound selects directly; wrap each as a subquery
+    return select(compound.subquery().c.id)
+
+
+def get_fuzzy_search(search: str) -> FuzzySearch:
+    """
+    Standard search widened with typo-tolerant name matches.
+
+    Every search token is resolved through the trigram index to the stored
+    first/last name spellings similar to it; a row matches when each token
+    matches its first or last name, or when the standard search matches.
+    The candidates are built as one id set,
+
+        standard ids UNION (token 1 ids INTERSECT token 2 ids ...)
 
-from app.models.employee import Employee
-from app.models.company import Company
-from app.models.department import Department
-from app.schemas.employee import ListEmployeeFilters
+    where each token's ids come from `first_name IN (...)` and
+    `last_name IN (...)` index lookups, and rows are then fetched by
+    primary key, so the table itself is never scanned. The rank is
+    computed in SQL from the similarities of the matched names.
+    """
+    standard_condition = get_search_condition(search)
+    similar_names = [
+        trigram_index.similar(token, settings.fuzzy_similarity_threshold, settings.fuzzy_max_terms)
+        for token in tokenize(search)
+    ]
+    if not similar_names or not all(similar_names):
+        return FuzzySearch(condition=standard_condition, rank=literal(0))
+
+    token_ids = []
+    token_ranks = []
+    for names in similar_names:
+        token_ids.append(_ids_of(union(
+            select(Employee.id).where(Employee.first_name.in_(names)),
+            select(Employee.id).where(Employee.last_name.in_(names)),
+        )))
+        token_ranks.append(sql_func.max(
+            case(names, value=Employee.first_name, else_=0),
+            case(names, value=Employee.last_name, else_=0),
+        ))
+
+    name_ids = token_ids[0] if len(token_ids) == 1 else _ids_of(intersect(*token_ids))
+    candidate_ids = union(_ids_of(get_search_ids(search)), name_ids)
+
+    return FuzzySearch(
+        condition=Employee.id.in_(_ids_of(candidate_ids)),
+        rank=sum(token_ranks[1:], token_ranks[0]),
+    )
+
+
+def get_filters_search_condition(filters: ListEmployeeFilters):
+    if filters.search_mode == SearchMode.FUZZY:
+        return get_fuzzy_search(filters.search).condition
+    return get_search_condition(filters.search)
+
+
+def prepare_search(session: Session, filters: ListEmployeeFilters) -> None:
+    """Make sure the in-memory index a fuzzy search resolves against is loaded."""
+    if _is_fuzzy(filters):
+        trigram_index.refresh_if_stale(session)
 
 
 def get_employees(
     session: Session,
     filters: ListEmployeeFilters
 ) -> Tuple[int, List[Employee]]:
-    base_query = (
-        select(
-            *Employee.__table__.columns,
-            Company.name.label("company_name"),
-            Department.name.label("department_name"),
+    page = get_employee_page(session, filters)
+    return page.total, page.employees
+
+
+def get_employee_page(
+    session: Session,
+    filters: ListEmployeeFilters
+) -> EmployeePage:
+    """
+    Fetch one page of employees.
+
+    Pages are ordered by `filters.effective_sort` with id as the tiebreaker,
+    so the order is total and stable. With `filters.cursor` the page starts
+    right after the row the cursor points at (keyset pagination, constant
+    cost at any depth for id and name sorts); otherwise `filters.page` is
+    used as an OFFSET. Either way the returned `next_cursor` continues from
+    the last row of the page.
+
+    Filter-only listings are resolved by the in-memory bitmap filter index
+    when it is enabled and up to date, so SQLite only fetches the page ids.
+    With QUERY_EXECUTION=parallel the count runs on a second pooled
+    connection while this session fetches the page.
+
+    With `filters.organisation_id` only the identity columns and that
+    organisation's `employee_display_columns` are selected.
+    """
+    cursor = get_cursor(filters)
+
+    if _uses_filter_index(session, filters):
+        return _get_page_from_filter_index(session, filters, cursor)
+
+    prepare_search(session, filters)
+    columns = get_listing_columns(session, filters)
+    page_query, count_query = build_listing_queries(filters, cursor, columns)
+
+    if _runs_in_parallel(session):
+        bind = session.get_bind()
+        count_future = query_executor.submit(_count_on_new_session, bind, filters, count_query)
+        rows = list(session.exec(page_query).all())
+        total, total_is_estimate = count_future.result()
+    else:
+        total, total_is_estimate = count_employees(session, filters, count_query)
+        rows = list(session.exec(page_query).all())
+
+    return _build_page(filters, rows, total, total_is_estimate)
+
+
+async def get_employee_page_async(
+    session: AsyncSession,
+    filters: ListEmployeeFilters
+) -> EmployeePage:
+    """
+    Async variant of `get_employee_page` for the event-loop request path.
+
+    The listing logic runs through `run_sync`, which drives the async driver
+    from a greenlet: statements are awaited on the loop without holding a
+    worker thread, and the count strategies, filter index and pagination
+    behave exactly as in the sync path. In parallel mode the count and the
+    page are awaited together on two sessions.
+    """
+    cursor = get_cursor(filters)
+
+    if await session.run_sync(_uses_filter_index, filters):
+        return await session.run_sync(_get_page_from_filter_index, filters, cursor)
+
+    if not _runs_in_parallel(session):
+        return await session.run_sync(get_employee_page, filters)
+
+    await session.run_sync(prepare_search, filters)
+    columns = await session.run_sync(get_listing_columns, filters)
+    page_query, count_query = build_listing_queries(filters, cursor, columns)
+
+    async def fetch_rows():
+        return list((await session.exec(page_query)).all())
+
+    async with AsyncSession(session.bind) as count_session:
+        (total, total_is_estimate), rows = await asyncio.gather(
+            count_session.run_sync(count_employees, filters, count_query),
+            fetch_rows(),
         )
-        .join(Company, Employee.company_id == Company.id)
-        .join(Department, Employee.department_id == Department.id)
-    )
-    count_query = select(func.count(Employee.id))
-    
+
+    return _build_page(filters, rows, total, total_is_estimate)
+
+
+async def get_employees_async(
+    session: AsyncSession,
+    filters: ListEmployeeFilters
+) -> Tuple[int, List[Employee]]:
+    page = await get_employee_page_async(session, filters)
+    return page.total, page.employees
+
+
+def get_listing_columns(session: Session, filters: ListEmployeeFilters) -> Optional[List[str]]:
+    """Columns to list for the filtered organisation, or None for all of them."""
+    if filters.organisation_id is None:
+        return None
+
+    display_columns = organisation_settings_store.display_columns(session, filters.organisation_id)
+    if display_columns is None:
+        return None
+
+    return [*IDENTITY_COLUMNS, *(name for name in DISPLAY_COLUMNS if name in display_columns)]
+
+
+def get_cursor(filters: ListEmployeeFilters) -> Optional[Cursor]:
+    if not filters.cursor:
+        return None
+
+    cursor = decode_cursor(filters.cursor)
+    if cursor.sort != filters.effective_sort.value:
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    return cursor
+
+
+def base_query(columns: Optional[List[str]] = None):
+    # company_name / department_name are denormalized onto employee, so
+    # listings read a single table
+    table_columns = Employee.__table__.columns
+    if columns is None:
+        return select(*table_columns)
+    return select(*(table_columns[name] for name in columns))
+
+
+def _is_fuzzy(filters: ListEmployeeFilters) -> bool:
+    return bool(filters.search) and filters.search_mode == SearchMode.FUZZY
+
+
+def apply_filters(query, filters: ListEmployeeFilters, search_condition=None):
+    if filters.organisation_id is not None:
+        query = query.where(Employee.organisation_id == filters.organisation_id)
+
     if filters.positions:
-        base_query = base_query.where(Employee.position.in_(filters.positions))
-        count_query = count_query.where(Employee.position.in_(filters.positions))
+        query = query.where(Employee.position.in_(filters.positions))
 
     if filters.locations:
-        base_query = base_query.where(Employee.location.in_(filters.locations))
-        count_query = count_query.where(Employee.location.in_(filters.locations))
+        query = query.where(Employee.location.in_(filters.locations))
 
     if filters.company_ids:
-        base_query = base_query.where(Employee.company_id.in_(filters.company_ids))
-        count_query = count_query.where(Employee.company_id.in_(filters.company_ids))
+        query = query.where(Employee.company_id.in_(filters.company_ids))
 
     if filters.department_ids:
-        base_query = base_query.where(Employee.department_id.in_(filters.department_ids))
-        count_query = count_query.where(Employee.department_id.in_(filters.department_ids))
+        query = query.where(Employee.department_id.in_(filters.department_ids))
 
     if filters.statuses:
-        base_query = base_query.where(Employee.status.in_(filters.statuses))
-        count_query = count_query.where(Employee.status.in_(filters.statuses))
+        query = query.where(Employee.status.in_(filters.statuses))
 
     if filters.search:
-        search_pattern = f"%{filters.search}%"
-        search_condition = or_(
-            sql_func.lower(Employee.first_name).like(sql_func.lower(search_pattern)),
-            sql_func.lower(Employee.last_name).like(sql_func.lower(search_pattern)),
-            sql_func.lower(Employee.email).like(sql_func.lower(search_pattern))
+        if search_condition is None:
+            search_condition = get_filters_search_condition(filters)
+        query = query.where(search_condition)
+
+    return query
+
+
+def _sort_key(filters: ListEmployeeFilters, fuzzy_rank=None):
+    """SQL expression of the primary sort key, or None when sorting by id alone."""
+    sort = filters.effective_sort
+    if sort == SortOrder.RELEVANCE:
+        relevance = get_relevance(filters.search)
+        if fuzzy_rank is not None:
+            # Name similarity breaks ties within a relevance tier; divided so
+            # it stays below 1 whatever the number of tokens
+            relevance = relevance + fuzzy_rank / (len(tokenize(filters.search)) + 1)
+        return relevance
+    return SORT_COLUMNS.get(sort)
+
+
+def build_listing_queries(
+    filters: ListEmployeeFilters,
+    cursor: Optional[Cursor],
+    columns: Optional[List[str]] = None,
+):
+    search_condition = None
+    fuzzy_rank = None
+    if _is_fuzzy(filters):
+        # Resolve the similar names once for both queries
+        search_condition, fuzzy_rank = get_fuzzy_search(filters.search)
+
+    filtered_query = apply_filters(base_query(columns), filters, search_condition)
+    count_query = apply_filters(select(func.count(Employee.id)), filters, search_condition)
+
+    sort_key = _sort_key(filters, fuzzy_rank)
+    merged_query = _merged_id_ranges(filters, cursor, columns) if sort_key is None else None
+    if merged_query is not None:
+        paginated_query = merged_query
+    elif sort_key is None:
+        paginated_query = filtered_query.order_by(Employee.id)
+        if cursor is not None:
+            paginated_query = paginated_query.where(Employee.id > cursor.id)
+    else:
+        descending = filters.effective_sort == SortOrder.RELEVANCE
+        # Selected too, so the next cursor can carry the key of the last row
+        paginated_query = filtered_query.add_columns(sort_key.label("sort_key")).order_by(
+            sort_key.desc() if descending else sort_key,
+            Employee.id,
+        )
+        if cursor is not None:
+            after_key = sort_key < cursor.key if descending else sort_key > cursor.key
+            paginated_query = paginated_query.where(
+                or_(after_key, and_(sort_key == cursor.key, Employee.id > cursor.id))
+            )
+
+    if cursor is None:
+        paginated_query = paginated_query.offset((filters.page - 1) * filters.page_size)
+
+    # Fetch one extra row to know whether there is a next page
+    return paginated_query.limit(filters.page_size + 1), count_query
+
+
+def _merged_id_ranges(
+    filters: ListEmployeeFilters,
+    cursor: Optional[Cursor],
+    columns: Optional[List[str]] = None,
+):
+    """
+    Id-ordered page query over several companies or statuses, or None.
+
+    With IN lists on company_id and status, SQLite reads several ranges of
+    ix_employee_company_id_status_id and sorts every match in a temporary
+    B-tree before applying LIMIT. One branch per (company, status) pair
+    reads a single range, already in id order, and SQLite merges the
+    branches of the UNION ALL, stopping after the page. Status is never
+    null, so a listing without a status filter is merged over every status.
+    """
+    if filters.search or not filters.company_ids:
+        return None
+
+    statuses = filters.statuses or list(EmployeeStatus)
+    pairs = list(product(dict.fromkeys(filters.company_ids), dict.fromkeys(statuses)))
+    if len(pairs) < 2 or len(pairs) > MAX_MERGED_RANGES:
+        return None
+
+    branches = []
+    for company_id, status in pairs:
+        branch = apply_filters(
+            base_query(columns),
+            filters.model_copy(update={"company_ids": [company_id], "statuses": [status]}),
         )
-        base_query = base_query.where(search_condition)
-        count_query = count_query.where(search_condition)
-    
-    total = session.exec(count_query).one()
+        if cursor is not None:
+            branch = branch.where(Employee.id > cursor.id)
+        branches.append(branch)
+
+    merged = union_all(*branches)
+    return merged.order_by(merged.selected_columns.id)
+
+
+def _build_page(filters: ListEmployeeFilters, rows, total: int, total_is_estimate: bool) -> EmployeePage:
+    employees = rows[:filters.page_size]
+
+    next_cursor = None
+    if len(rows) > filters.page_size:
+        last = employees[-1]
+        sort = filters.effective_sort
+        if sort == SortOrder.ID:
+            next_cursor = _id_cursor(last.id)
+        else:
+            next_cursor = encode_cursor(Cursor(sort=sort.value, key=last.sort_key, id=last.id))
+
+    return EmployeePage(
+        total=total,
+        employees=employees,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
+    )
+
+
+def _id_cursor(last_id: int) -> str:
+    return encode_cursor(Cursor(sort=SortOrder.ID.value, key=last_id, id=last_id))
+
+
+def _runs_in_parallel(session) -> bool:
+    if settings.query_execution != "parallel":
+        return False
+
+    # Every connection to an in-memory database sees a different database
+    database = session.bind.url.database if session.bind is not None else None
+    return bool(database) and database != ":memory:"
+
+
+def _count_on_new_session(bind, filters: ListEmployeeFilters, count_query) -> Tuple[int, bool]:
+    with Session(bind) as count_session:
+        return count_employees(count_session, filters, count_query)
+
+
+def _uses_filter_index(session: Session, filters: ListEmployeeFilters) -> bool:
+    # The index yields ids in id order only
+    if filters.search or filters.effective_sort != SortOrder.ID or not settings.filter_index_enabled:
+        return False
+
+    if not filter_index.is_current(session):
+        # Serve this request from SQL while the snapshot is rebuilt
+        filter_index.refresh_in_background()
+        return False
+
+    return True
+
+
+def _get_page_from_filter_index(
+    session: Session,
+    filters: ListEmployeeFilters,
+    cursor: Optional[Cursor],
+) -> EmployeePage:
+    result = filter_index.search(
+        filters,
+        offset=(filters.page - 1) * filters.page_size,
+        after_id=cursor.id if cursor is not None else None,
+    )
 
-    paginated_query = base_query.offset((filters.page - 1) * filters.page_size).limit(filters.page_size)
-    employees = list(session.exec(paginated_query).all())
+    employees = []
+    if result.ids:
+        columns = get_listing_columns(session, filters)
+        page_query = base_query(columns).where(Employee.id.in_(result.ids)).order_by(Employee.id)
+        employees = list(session.exec(page_query).all())
 
-    return total, employees
+    next_cursor = _id_cursor(result.ids[-1]) if result.has_more else None
 
+    return EmployeePage(total=result.total, employees=employees, next_cursor=next_cursor)
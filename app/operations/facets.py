@@ -0,0 +1,97 @@
+from sqlmodel import Session, select, func
+from typing import Any, Dict, List
+
+from app.core.facet_index import NULL_DEPARTMENT_ID, NULL_TEXT
+from app.models.company import Company
+from app.models.department import Department
+from app.models.employee import Employee
+from app.models.employee_facet_count import EmployeeFacetCount
+from app.operations.employee import get_filters_search_condition, prepare_search
+from app.schemas.employee import FILTER_COLUMNS, EmployeeFacets, FacetValue, ListEmployeeFilters
+
+
+# faceted filter name -> (aggregate column, value stored for NULL); the
+# employee column is the filter's FILTER_COLUMNS entry
+DIMENSIONS = {
+    "statuses": (EmployeeFacetCount.status, None),
+    "company_ids": (EmployeeFacetCount.company_id, None),
+    "department_ids": (EmployeeFacetCount.department_id, NULL_DEPARTMENT_ID),
+    "positions": (EmployeeFacetCount.position, NULL_TEXT),
+    "locations": (EmployeeFacetCount.location, NULL_TEXT),
+}
+
+
+def _count_from_aggregate(session: Session, filters: ListEmployeeFilters, name: str):
+    facet_column, _ = DIMENSIONS[name]
+    query = select(facet_column, func.sum(EmployeeFacetCount.count)).group_by(facet_column)
+
+    for other, (other_column, _) in DIMENSIONS.items():
+        values = getattr(filters, other)
+        if other != name and values:
+            query = query.where(other_column.in_(values))
+
+    return session.exec(query).all()
+
+
+def _count_live(session: Session, filters: ListEmployeeFilters, name: str):
+    employee_column = FILTER_COLUMNS[name]
+    query = select(employee_column, func.count(Employee.id)).group_by(employee_column)
+
+    if filters.organisation_id is not None:
+        query = query.where(Employee.organisation_id == filters.organisation_id)
+
+    for other in DIMENSIONS:
+        values = getattr(filters, other)
+        if other != name and values:
+            query = query.where(FILTER_COLUMNS[other].in_(values))
+
+    if filters.search:
+        query = query.where(get_filters_search_condition(filters))
+
+    return session.exec(query).all()
+
+
+def _labels(session: Session, model, ids: List[int]) -> Dict[int, str]:
+    if not ids:
+        return {}
+    rows = session.exec(select(model.id, model.name).where(model.id.in_(ids))).all()
+    return {row_id: name for row_id, name in rows}
+
+
+def get_facets(session: Session, filters: ListEmployeeFilters) -> EmployeeFacets:
+    """
+    Count employees per value of every filter dimension.
+
+    Each dimension is counted with all the other filters applied but not its
+    own, so the counts show what selecting another value would return.
+    Filter-only requests are answered from the `employee_facet_count`
+    aggregate (one row per distinct dimension combination); a search can't
+    be answered from it, so those fall back to GROUP BY over the search
+    matches, and so does a restriction to one organisation, which the
+    aggregate doesn't break down by.
+    """
+    prepare_search(session, filters)
+
+    counts: Dict[str, List[Any]] = {}
+    for name, (_, null_value) in DIMENSIONS.items():
+        if filters.search or filters.organisation_id is not None:
+            rows = _count_live(session, filters, name)
+        else:
+            rows = _count_from_aggregate(session, filters, name)
+
+        counts[name] = sorted(
+            ((None if value == null_value else value, int(total)) for value, total in rows if total),
+            key=lambda item: -item[1],
+        )
+
+    company_names = _labels(session, Company, [value for value, _ in counts["company_ids"] if value])
+    department_names = _labels(session, Department, [value for value, _ in counts["department_ids"] if value])
+    labels = {"company_ids": company_names, "department_ids": department_names}
+
+    return EmployeeFacets(**{
+        name: [
+            FacetValue(value=value, label=labels.get(name, {}).get(value), count=total)
+            for value, total in values
+        ]
+        for name, values in counts.items()
+    })
@@ -0,0 +1,47 @@
+from typing import Any, Dict, Hashable, Iterable, List
+
+from sqlmodel import Session
+
+from app.models.employee import Employee
+from app.operations.employee import base_query
+from app.schemas.employee import EmployeeLookup, EmployeeLookupMatches, EmployeeLookupResult
+
+
+def _fetch_by(session: Session, column, keys: List[Hashable], chunk_size: int) -> Dict[Hashable, Any]:
+    rows = {}
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start:start + chunk_size]
+        for row in session.exec(base_query().where(column.in_(chunk))):
+            rows[getattr(row, column.name)] = row
+    return rows
+
+
+def _unique(keys: Iterable[Hashable]) -> List[Hashable]:
+    return list(dict.fromkeys(keys))
+
+
+def lookup_employees(session: Session, lookup: EmployeeLookup, chunk_size: int) -> EmployeeLookupResult:
+    """
+    Resolve many employee ids and emails at once.
+
+    Keys are de-duplicated and fetched with one `IN (...)` query per
+    `chunk_size` keys on the indexed `id` / `email` columns (emails match
+    exactly). Results are keyed by the requested value; keys that matched
+    nothing are listed under `missing`, in request order.
+    """
+    ids = _unique(lookup.ids)
+    emails = _unique(lookup.emails)
+
+    by_id = _fetch_by(session, Employee.id, ids, chunk_size)
+    by_email = _fetch_by(session, Employee.email, emails, chunk_size)
+
+    return EmployeeLookupResult(
+        found=EmployeeLookupMatches.model_validate(
+            {"ids": by_id, "emails": by_email},
+            from_attributes=True,
+        ),
+        missing=EmployeeLookup(
+            ids=[key for key in ids if key not in by_id],
+            emails=[key for key in emails if key not in by_email],
+        ),
+    )
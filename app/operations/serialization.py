@@ -0,0 +1,48 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+from pydantic_core import to_json
+
+from app.operations.employee import EmployeePage
+from app.schemas.employee import Employee, ListEmployeeFilters
+
+
+# Response field order of an employee, as declared on the schema
+EMPLOYEE_FIELDS = tuple(Employee.model_fields)
+
+
+def employee_fields(row_fields: Sequence[str]) -> List[Tuple[str, int]]:
+    """Schema fields present in a result, in schema order, with their row positions."""
+    positions = {name: position for position, name in enumerate(row_fields)}
+    return [(name, positions[name]) for name in EMPLOYEE_FIELDS if name in positions]
+
+
+def employee_dicts(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+    if not rows:
+        return []
+
+    # Every row of a page comes from the same SELECT, so resolve the schema
+    # fields to row positions once; fields that weren't selected are omitted
+    # exactly like the unset fields of the validated response.
+    fields = employee_fields(rows[0]._fields)
+    return [{name: row[position] for name, position in fields} for row in rows]
+
+
+def serialize_employee_page(filters: ListEmployeeFilters, page: EmployeePage, total_pages: int) -> bytes:
+    """
+    Render a listing page as `PaginatedResponse[Employee]` JSON without
+    building a model per row.
+
+    The rows are the SQL `Row`s the listing queries return; their values are
+    already of the schema's types, so they are only reshaped into dicts and
+    encoded by pydantic-core in one call. The output is byte-for-byte what
+    `PaginatedResponse[Employee].model_dump_json(exclude_unset=True)` gives.
+    """
+    return to_json({
+        "page": filters.page,
+        "page_size": filters.page_size,
+        "total": page.total,
+        "total_is_estimate": page.total_is_estimate,
+        "total_pages": total_pages,
+        "data": employee_dicts(page.employees),
+        "next_cursor": page.next_cursor,
+    })
@@ -1,10 +1,31 @@
-from app.schemas.employee import Employee
+from app.schemas.employee import (
+    Employee,
+    EmployeeFacets,
+    EmployeeLookup,
+    EmployeeLookupMatches,
+    EmployeeLookupResult,
+    EmployeeSuggestion,
+    ExportFormat,
+    FacetValue,
+    ListEmployeeFilters,
+    SearchMode,
+    SortOrder,
+)
 from app.schemas.pagination import PaginatedResponse
 
 
 __all__ = [
     "Employee",
+    "EmployeeFacets",
+    "EmployeeLookup",
+    "EmployeeLookupMatches",
+    "EmployeeLookupResult",
+    "EmployeeSuggestion",
+    "ExportFormat",
+    "FacetValue",
     "ListEmployeeFilters",
     "PaginatedResponse",
+    "SearchMode",
+    "SortOrder",
 ]
 
@@ -1,7 +1,9 @@
+from enum import Enum
 from pydantic import BaseModel
-from typing import List
+from typing import Any, Dict, List, Tuple
 
-from app.models.employee import EmployeeStatus
+from app.models.employee import Employee as EmployeeRow, EmployeeStatus
+from app.schemas.pagination import CountStrategy
 
 
 class Employee(BaseModel):
@@ -17,13 +19,126 @@ class Employee(BaseModel):
     location: str | None = None
 
 
+class SearchMode(str, Enum):
+    # Substring match (LIKE) or token prefix match (FTS), per SEARCH_BACKEND
+    STANDARD = "standard"
+    # Also matches names within a trigram similarity of the search tokens
+    FUZZY = "fuzzy"
+
+
+class SortOrder(str, Enum):
+    # Exact > prefix > substring match of the search, then id
+    RELEVANCE = "relevance"
+    LAST_NAME = "last_name"
+    FIRST_NAME = "first_name"
+    ID = "id"
+
+
 class ListEmployeeFilters(BaseModel):
     page: int = 1
     page_size: int = 10
+    organisation_id: int | None = None
     statuses: List[EmployeeStatus] = []
     company_ids: List[int] = []
     department_ids: List[int] = []
     positions: List[str] = []
     locations: List[str] = []
     search: str | None = None
+    search_mode: SearchMode = SearchMode.STANDARD
+    sort: SortOrder | None = None
+    cursor: str | None = None
+    count_strategy: CountStrategy | None = None
+
+    @property
+    def effective_sort(self) -> SortOrder:
+        """The requested order; relevance when searching and id otherwise by default."""
+        if self.sort == SortOrder.RELEVANCE or self.sort is None:
+            return SortOrder.RELEVANCE if self.search else SortOrder.ID
+        return self.sort
+
+    def filter_key(self) -> Tuple:
+        """Hashable key of the row-selecting filters, independent of value order and paging."""
+        return (
+            self.organisation_id,
+            tuple(sorted(status.value for status in self.statuses)),
+            tuple(sorted(set(self.company_ids))),
+            tuple(sorted(set(self.department_ids))),
+            tuple(sorted(set(self.positions))),
+            tuple(sorted(set(self.locations))),
+            self.search,
+            self.search_mode.value if self.search else None,
+        )
+
+    def filter_values(self, name: str) -> List[Any]:
+        """Values of a filter as a list; an unset single-valued filter gives []."""
+        value = getattr(self, name)
+        if isinstance(value, list):
+            return value
+        return [] if value is None else [value]
+
+    def cache_key(self) -> Tuple:
+        """Hashable key of everything that shapes a listing response."""
+        return self.filter_key() + (
+            self.page,
+            self.page_size,
+            self.effective_sort,
+            self.cursor,
+            self.count_strategy,
+        )
+
+
+# filter name -> the employee column it restricts, for the in-memory indexes
+# and statistics that resolve filters without building a query
+FILTER_COLUMNS = {
+    "organisation_id": EmployeeRow.organisation_id,
+    "statuses": EmployeeRow.status,
+    "company_ids": EmployeeRow.company_id,
+    "department_ids": EmployeeRow.department_id,
+    "positions": EmployeeRow.position,
+    "locations": EmployeeRow.location,
+}
+
+
+class EmployeeSuggestion(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+
+
+class EmployeeLookup(BaseModel):
+    ids: List[int] = []
+    emails: List[str] = []
+
+
+class EmployeeLookupMatches(BaseModel):
+    ids: Dict[int, Employee] = {}
+    emails: Dict[str, Employee] = {}
+
+
+class EmployeeLookupResult(BaseModel):
+    found: EmployeeLookupMatches
+    missing: EmployeeLookup
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        return "application/x-ndjson" if self is ExportFormat.NDJSON else "text/csv"
+
+
+class FacetValue(BaseModel):
+    value: str | int | None
+    label: str | None = None
+    count: int
+
 
+class EmployeeFacets(BaseModel):
+    statuses: List[FacetValue] = []
+    company_ids: List[FacetValue] = []
+    department_ids: List[FacetValue] = []
+    positions: List[FacetValue] = []
+    locations: List[FacetValue] = []
@@ -1,3 +1,4 @@
+from enum import Enum
 from pydantic import BaseModel, ConfigDict
 from typing import Generic, TypeVar
 from typing_extensions import List
@@ -5,12 +6,20 @@ from typing_extensions import List
 T = TypeVar('T')
 
 
+class CountStrategy(str, Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATE = "estimate"
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     
     page: int
     page_size: int
     total: int
+    total_is_estimate: bool = False
     total_pages: int
     data: List[T]
+    next_cursor: str | None = None
 
@@ -0,0 +1,35 @@
+import time
+
+from app.core.database import engine, init_db
+from app.core.employee_names import add_name_columns, backfill_employee_names, create_name_triggers
+
+
+def denormalize_employee_names() -> None:
+    """
+    Add `company_name` / `department_name` to an existing employee table,
+    install the triggers that keep them in sync and fill them in. Safe to run
+    more than once.
+    """
+    print("=" * 60)
+    print("Denormalizing company and department names onto employee...")
+    print("=" * 60)
+
+    init_db()
+
+    started_at = time.perf_counter()
+    with engine.begin() as connection:
+        print("  Adding name columns (if missing)")
+        add_name_columns(connection)
+
+        print("  Creating sync triggers (if missing)")
+        create_name_triggers(connection)
+
+        print("  Backfilling names from company and department")
+        backfill_employee_names(connection)
+
+    elapsed = time.perf_counter() - started_at
+    print(f"  ✓ Done in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    denormalize_employee_names()
@@ -0,0 +1,144 @@
+import argparse
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.dialects import sqlite
+
+from app.core.config import settings
+from app.core.database import engine, init_db
+from app.models.employee import Employee, EmployeeStatus
+from app.operations.cursor import Cursor, encode_cursor
+from app.operations.employee import build_listing_queries, get_cursor
+from app.schemas.employee import ListEmployeeFilters, SortOrder
+
+
+# Replaced by the composite indexes on Employee, whose prefixes cover them
+OBSOLETE_INDEXES = [
+    "ix_employee_company_id_status_location",
+    "ix_employee_company_id",
+    "ix_employee_status",
+    "ix_employee_organisation_id",
+]
+
+
+REPRESENTATIVE_QUERIES: List[Tuple[str, ListEmployeeFilters]] = [
+    ("first page", ListEmployeeFilters()),
+    ("company", ListEmployeeFilters(company_ids=[1])),
+    ("company + one status", ListEmployeeFilters(
+        company_ids=[1], statuses=[EmployeeStatus.ACTIVE],
+    )),
+    ("companies + status", ListEmployeeFilters(
+        company_ids=[1, 2], statuses=[EmployeeStatus.ACTIVE],
+    )),
+    ("company + status + location", ListEmployeeFilters(
+        company_ids=[1], statuses=[EmployeeStatus.ACTIVE], locations=["Singapore", "Jakarta"],
+    )),
+    ("status + location", ListEmployeeFilters(
+        statuses=[EmployeeStatus.INACTIVE], locations=["Singapore"],
+    )),
+    ("department", ListEmployeeFilters(department_ids=[1, 2])),
+    ("position + location", ListEmployeeFilters(
+        positions=["Software Engineer"], locations=["Singapore"],
+    )),
+    ("search", ListEmployeeFilters(search="john")),
+    ("last name order", ListEmployeeFilters(sort=SortOrder.LAST_NAME)),
+    ("last name order, cursor", ListEmployeeFilters(
+        sort=SortOrder.LAST_NAME, cursor=encode_cursor(Cursor(sort="last_name", key="Smith", id=1_000)),
+    )),
+    ("deep offset", ListEmployeeFilters(page=10_000, page_size=100)),
+    ("cursor", ListEmployeeFilters(
+        page_size=100, cursor=encode_cursor(Cursor(sort="id", key=1_000_000, id=1_000_000)),
+    )),
+]
+
+
+def classify(plan: List[str]) -> str:
+    """Worst access to the employee table in a plan: full scan, index scan or search."""
+    details = [detail for detail in plan if detail.split(" ")[1:2] == ["employee"]]
+    if any(detail == "SCAN employee" for detail in details):
+        return "FULL SCAN"
+    if any(detail.startswith("SCAN employee") for detail in details):
+        return "INDEX SCAN"
+    return "SEARCH"
+
+
+def explain(connection, query) -> List[str]:
+    sql = str(query.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return [row[-1] for row in rows]
+
+
+def explain_queries(
+    create_missing_indexes: bool = False,
+    drop_obsolete_indexes: bool = False,
+    analyze: bool = False,
+) -> None:
+    print("=" * 60)
+    print(f"Query plans (search backend: {settings.search_backend})")
+    print("=" * 60)
+
+    init_db()
+
+    with engine.begin() as connection:
+        if create_missing_indexes:
+            for index in Employee.__table__.indexes:
+                index.create(connection, checkfirst=True)
+            print("Created missing employee indexes")
+
+        if drop_obsolete_indexes:
+            for name in OBSOLETE_INDEXES:
+                connection.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+            print("Dropped obsolete employee indexes")
+
+        if analyze:
+            connection.execute(text("ANALYZE"))
+            print("Refreshed planner statistics (ANALYZE)")
+
+        full_scans = []
+        for name, filters in REPRESENTATIVE_QUERIES:
+            page_query, count_query = build_listing_queries(filters, get_cursor(filters))
+
+            for kind, query in (("count", count_query), ("page", page_query)):
+                plan = explain(connection, query)
+                verdict = classify(plan)
+                if verdict == "FULL SCAN":
+                    full_scans.append(f"{name} ({kind})")
+
+                print(f"\n[{verdict}] {name} - {kind}")
+                for detail in plan:
+                    print(f"    {detail}")
+
+    print("\n" + "=" * 60)
+    if full_scans:
+        print(f"{len(full_scans)} queries still scan the whole employee table:")
+        for name in full_scans:
+            print(f"  - {name}")
+    else:
+        print("No representative query scans the whole employee table")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report EXPLAIN QUERY PLAN for representative listing queries")
+    parser.add_argument(
+        "--create-missing-indexes",
+        action="store_true",
+        help="create indexes declared on the Employee model that the database lacks",
+    )
+    parser.add_argument(
+        "--drop-obsolete-indexes",
+        action="store_true",
+        help="drop employee indexes that the composite indexes have replaced",
+    )
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="run ANALYZE first so the planner sees current table statistics",
+    )
+    args = parser.parse_args()
+
+    explain_queries(
+        create_missing_indexes=args.create_missing_indexes,
+        drop_obsolete_indexes=args.drop_obsolete_indexes,
+        analyze=args.analyze,
+    )
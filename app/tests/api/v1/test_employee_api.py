@@ -0,0 +1,584 @@
+import base64
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, create_engine, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import rate_limit_deps
+from app.api.deps.rate_limit_deps import rate_limit_dependency
+from app.core.async_rate_limiter import AsyncSlidingWindowRateLimiter
+from app.core.config import RateLimit
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.core.trigram_index import trigram_index
+from app.core.typeahead_index import typeahead_index
+from app.api.v1.employee import filters_rate_limit, list_employees_async, listing_rate_limit
+from app.core.database import get_async_session, get_session
+from app.main import app
+from app.models import Company, Department, Employee, Organisation, OrganisationSettings
+from app.core.organisation_settings import organisation_settings_store
+from app.models.employee import EmployeeStatus
+from app.operations.counting import employee_statistics
+from app.schemas.employee import Employee as EmployeeSchema
+from app.schemas.pagination import PaginatedResponse
+
+
+@pytest.fixture(scope="function")
+def test_db():
+    # Use a temporary file for the database to avoid connection issues
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(db_fd)
+    
+    engine = create_engine(f"sqlite:///{db_path}", echo=False, connect_args={"check_same_thread": False})
+    
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+    
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+    if os.path.exists(db_path):
+        os.unlink(db_path)
+
+
+@pytest.fixture(scope="function")
+def session(test_db):
+    with Session(test_db) as session:
+        yield session
+        session.rollback()
+
+
+@pytest.fixture(scope="function")
+def test_data(session):
+    org = Organisation(name="Test Organisation")
+    session.add(org)
+    session.commit()
+    session.refresh(org)
+    
+    company1 = Company(name="Company A", organisation_id=org.id)
+    company2 = Company(name="Company B", organisation_id=org.id)
+    session.add_all([company1, company2])
+    session.commit()
+    session.refresh(company1)
+    session.refresh(company2)
+    
+    dept1 = Department(name="Engineering", company_id=company1.id, organisation_id=org.id)
+    dept2 = Department(name="Sales", company_id=company2.id, organisation_id=org.id)
+    session.add_all([dept1, dept2])
+    session.commit()
+    session.refresh(dept1)
+    session.refresh(dept2)
+    
+    employees = [
+        Employee(
+            first_name="John", last_name="Doe", email="john.doe@test.com",
+            status=EmployeeStatus.ACTIVE, company_id=company1.id,
+            organisation_id=org.id, department_id=dept1.id,
+            position="Software Engineer", location="Singapore"
+        ),
+        Employee(
+            first_name="Jane", last_name="Smith", email="jane.smith@test.com",
+            status=EmployeeStatus.ACTIVE, company_id=company1.id,
+            organisation_id=org.id, department_id=dept1.id,
+            position="Senior Engineer", location="Kuala Lumpur"
+        ),
+        Employee(
+            first_name="Bob", last_name="Johnson", email="bob.johnson@test.com",
+            status=EmployeeStatus.INACTIVE, company_id=company2.id,
+            organisation_id=org.id, department_id=dept2.id,
+            position="Sales Rep", location="Singapore"
+        ),
+    ]
+    session.add_all(employees)
+    session.commit()
+    
+    return {
+        "org": org,
+        "companies": [company1, company2],
+        "departments": [dept1, dept2],
+        "employees": employees
+    }
+
+
+@pytest.fixture(scope="function")
+def client(test_db, test_data):
+    SQLModel.metadata.create_all(test_db)
+    
+    def override_get_session():
+        with Session(test_db) as session:
+            yield session
+    
+    app.dependency_overrides[get_session] = override_get_session
+
+    async def override_rate_limit(request: Request):
+        return True
+    app.dependency_overrides[rate_limit_dependency] = override_rate_limit
+    app.dependency_overrides[listing_rate_limit] = override_rate_limit
+    app.dependency_overrides[filters_rate_limit] = override_rate_limit
+    
+    yield TestClient(app)
+    
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def async_client(test_db, test_data):
+    async_engine = create_async_engine(test_db.url.set(drivername="sqlite+aiosqlite"))
+    
+    async def override_get_async_session():
+        async with AsyncSession(async_engine) as session:
+            yield session
+    
+    async def override_rate_limit(request: Request):
+        return True
+    
+    async_app = FastAPI()
+    async_app.add_api_route(
+        "/employees",
+        list_employees_async,
+        methods=["GET"],
+        response_model=PaginatedResponse[EmployeeSchema],
+        response_model_exclude_unset=True,
+    )
+    async_app.dependency_overrides[get_async_session] = override_get_async_session
+    async_app.dependency_overrides[listing_rate_limit] = override_rate_limit
+    
+    with TestClient(async_app) as client:
+        yield client
+
+
+class TestListEmployeesEndpoint:
+    def test_list_employees_success(self, client, test_data):
+        response = client.get("/api/v1/employees")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert "page" in data
+        assert "page_size" in data
+        assert "total" in data
+        assert "total_pages" in data
+        assert "data" in data
+        assert len(data["data"]) == 3
+
+    def test_combined_filters(self, client, test_data):
+        company_id = test_data["companies"][0].id
+        company_name = test_data["companies"][0].name
+        response = client.get(
+            "/api/v1/employees"
+            "?statuses[]=ACTIVE"
+            f"&company_ids[]={company_id}"
+            "&locations[]=Singapore"
+        )
+        data = response.json()
+        
+        assert data["total"] == 1
+        emp = data["data"][0]
+        assert emp["status"] == "ACTIVE"
+        assert emp["company_name"] == company_name
+        assert emp["location"] == "Singapore"
+    
+    def test_empty_result(self, client, test_data):
+        response = client.get("/api/v1/employees?statuses[]=TERMINATED")
+        data = response.json()
+        
+        assert data["total"] == 0
+        assert len(data["data"]) == 0
+        assert data["total_pages"] == 0
+    
+    def test_response_structure(self, client, test_data):
+        response = client.get("/api/v1/employees")
+        data = response.json()
+        
+        assert isinstance(data["page"], int)
+        assert isinstance(data["page_size"], int)
+        assert isinstance(data["total"], int)
+        assert isinstance(data["total_pages"], int)
+        assert isinstance(data["data"], list)
+        
+        if data["data"]:
+            emp = data["data"][0]
+            assert "id" in emp
+            assert "first_name" in emp
+            assert "last_name" in emp
+            assert "email" in emp
+            assert "status" in emp
+    
+    def test_cursor_pagination(self, client, test_data):
+        first = client.get("/api/v1/employees?page_size=2").json()
+        assert len(first["data"]) == 2
+        assert first["next_cursor"]
+        
+        second = client.get(f"/api/v1/employees?page_size=2&cursor={first['next_cursor']}").json()
+        assert len(second["data"]) == 1
+        assert second["next_cursor"] is None
+        assert second["data"][0]["id"] > first["data"][-1]["id"]
+
+    def test_estimated_total(self, client, test_data):
+        data = client.get("/api/v1/employees?count=estimate&locations[]=Singapore").json()
+        
+        assert data["total"] == 2
+        assert data["total_is_estimate"] is True
+
+    def test_invalid_cursor(self, client, test_data):
+        response = client.get("/api/v1/employees?cursor=garbage")
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("payload, sort", [
+        (["last_name", {"a": 1}, 1], "last_name"),
+        (["id", 1, True], "id"),
+        (["id", 1, 2 ** 70], "id"),
+    ])
+    def test_tampered_cursor(self, client, test_data, payload, sort):
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+        response = client.get("/api/v1/employees", params={"cursor": cursor, "sort": sort})
+        assert response.status_code == 400
+    
+    def test_facets(self, client, test_data):
+        response = client.get("/api/v1/employees/facets?statuses[]=ACTIVE")
+        
+        assert response.status_code == 200
+        data = response.json()
+        locations = {facet["value"]: facet["count"] for facet in data["locations"]}
+        assert locations == {"Singapore": 1, "Kuala Lumpur": 1}
+        assert {facet["value"] for facet in data["statuses"]} == {"ACTIVE", "INACTIVE"}
+    
+    def test_invalid_query_parameters(self, client, test_data):
+        response = client.get("/api/v1/employees?page=0&page_size=0&page_size=101")
+        assert response.status_code == 422
+
+    def test_sort_with_cursor(self, client, test_data):
+        first = client.get("/api/v1/employees?sort=last_name&page_size=2").json()
+        second = client.get(f"/api/v1/employees?sort=last_name&page_size=2&cursor={first['next_cursor']}").json()
+        
+        assert [emp["last_name"] for emp in first["data"] + second["data"]] == ["Doe", "Johnson", "Smith"]
+        assert second["next_cursor"] is None
+        
+        response = client.get(f"/api/v1/employees?sort=first_name&cursor={first['next_cursor']}")
+        assert response.status_code == 400
+
+    def test_fuzzy_search(self, client, test_data):
+        trigram_index.invalidate()
+        assert client.get("/api/v1/employees?search=Jonh").json()["total"] == 0
+        
+        data = client.get("/api/v1/employees?search=Jonh&search_mode=fuzzy").json()
+        trigram_index.invalidate()
+        
+        assert [emp["last_name"] for emp in data["data"]] == ["Doe", "Johnson"]
+        assert data["next_cursor"] is None
+
+    def test_display_columns_projection(self, client, test_data, session):
+        organisation_settings_store.clear()
+        session.add(OrganisationSettings(
+            organisation_id=test_data["org"].id,
+            settings={"employee_display_columns": ["location"]},
+        ))
+        session.commit()
+        
+        response = client.get(f"/api/v1/employees?organisation_id={test_data['org'].id}")
+        organisation_settings_store.clear()
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert set(data["data"][0]) == {"id", "first_name", "last_name", "email", "status", "location"}
+
+
+class TestResponseCache:
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, monkeypatch):
+        monkeypatch.setattr(settings, "response_cache_enabled", True)
+        response_cache.clear()
+        yield
+        response_cache.clear()
+
+    def test_repeated_request_is_served_from_cache(self, client, test_data):
+        hits_before = response_cache.hits
+        
+        first = client.get("/api/v1/employees?statuses[]=ACTIVE")
+        second = client.get("/api/v1/employees?statuses[]=ACTIVE")
+        
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        assert first.json()["total"] == 2
+        assert response_cache.hits == hits_before + 1
+
+    def test_write_invalidates_cache(self, client, test_data, session):
+        assert client.get("/api/v1/employees").json()["total"] == 3
+        
+        employee = test_data["employees"][0]
+        session.delete(employee)
+        session.commit()
+        
+        assert client.get("/api/v1/employees").json()["total"] == 2
+
+    def test_metrics_expose_cache_stats(self, client, test_data):
+        client.get("/api/v1/employees")
+        client.get("/api/v1/employees")
+        
+        stats = client.get("/api/v1/metrics").json()["response_cache"]
+        assert stats["entries"] == 1
+        assert stats["hits"] >= 1
+        assert stats["misses"] >= 1
+
+
+class TestFastSerializer:
+    QUERIES = [
+        "/api/v1/employees",
+        "/api/v1/employees?statuses[]=ACTIVE&page_size=1",
+        "/api/v1/employees?search=nobody",
+    ]
+
+    def test_matches_pydantic_response(self, client, test_data, monkeypatch):
+        monkeypatch.setattr(settings, "single_flight_enabled", False)
+        expected = [client.get(query).json() for query in self.QUERIES]
+        
+        monkeypatch.setattr(settings, "response_serializer", "fast")
+        for query, body in zip(self.QUERIES, expected):
+            response = client.get(query)
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/json"
+            assert response.json() == body
+
+    def test_projected_columns_are_omitted(self, client, test_data, session, monkeypatch):
+        monkeypatch.setattr(settings, "response_serializer", "fast")
+        organisation_settings_store.clear()
+        session.add(OrganisationSettings(
+            organisation_id=test_data["org"].id,
+            settings={"employee_display_columns": ["position"]},
+        ))
+        session.commit()
+        
+        response = client.get(f"/api/v1/employees?organisation_id={test_data['org'].id}")
+        organisation_settings_store.clear()
+        
+        assert list(response.json()["data"][0]) == ["id", "first_name", "last_name", "email", "status", "position"]
+
+
+class TestTypeaheadEndpoint:
+    def test_suggestions(self, client, test_data):
+        typeahead_index.clear()
+        response = client.get("/api/v1/employees/typeahead?q=ja&limit=5")
+        typeahead_index.clear()
+        
+        assert response.status_code == 200
+        assert response.json() == [{
+            "id": test_data["employees"][1].id,
+            "first_name": "Jane",
+            "last_name": "Smith",
+            "email": "jane.smith@test.com",
+        }]
+
+    def test_query_is_required(self, client, test_data):
+        assert client.get("/api/v1/employees/typeahead").status_code == 422
+
+
+class TestLookupEndpoint:
+    def test_lookup_by_ids_and_emails(self, client, test_data, monkeypatch):
+        monkeypatch.setattr(settings, "lookup_chunk_size", 2)
+        john, jane, bob = test_data["employees"]
+        
+        response = client.post("/api/v1/employees/lookup", json={
+            "ids": [bob.id, john.id, 9999, john.id, jane.id],
+            "emails": ["jane.smith@test.com", "nobody@test.com"],
+        })
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data["found"]["ids"]) == {str(john.id), str(jane.id), str(bob.id)}
+        assert data["found"]["ids"][str(bob.id)]["last_name"] == "Johnson"
+        assert data["found"]["emails"]["jane.smith@test.com"]["id"] == jane.id
+        assert data["missing"] == {"ids": [9999], "emails": ["nobody@test.com"]}
+
+    def test_empty_lookup(self, client, test_data):
+        response = client.post("/api/v1/employees/lookup", json={})
+        
+        assert response.status_code == 200
+        assert response.json() == {
+            "found": {"ids": {}, "emails": {}},
+            "missing": {"ids": [], "emails": []},
+        }
+
+    def test_too_many_keys(self, client, test_data, monkeypatch):
+        monkeypatch.setattr(settings, "lookup_max_keys", 2)
+        
+        response = client.post("/api/v1/employees/lookup", json={"ids": [1, 2], "emails": ["a@test.com"]})
+        assert response.status_code == 400
+
+
+class TestExportEndpoint:
+    @pytest.fixture(autouse=True)
+    def small_batches(self, monkeypatch):
+        monkeypatch.setattr(settings, "export_batch_size", 2)
+
+    def test_ndjson_export(self, client, test_data):
+        response = client.get("/api/v1/employees/export", headers={"Accept-Encoding": "identity"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "content-length" not in response.headers
+        assert "content-encoding" not in response.headers
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["last_name"] for row in rows] == ["Doe", "Smith", "Johnson"]
+        assert rows[0]["company_name"] == "Company A"
+
+    def test_csv_export_with_filters(self, client, test_data):
+        response = client.get("/api/v1/employees/export?format=csv&statuses[]=ACTIVE")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["email"] for row in rows] == ["john.doe@test.com", "jane.smith@test.com"]
+        assert rows[0]["status"] == "ACTIVE"
+        assert rows[0]["phone_number"] == ""
+
+    def test_empty_csv_export_has_header(self, client, test_data):
+        response = client.get("/api/v1/employees/export?format=csv&statuses[]=TERMINATED")
+        
+        assert response.text.splitlines() == [
+            "id,first_name,last_name,email,phone_number,status,company_name,department_name,position,location",
+        ]
+
+    def test_gzip_export(self, client, test_data):
+        response = client.get("/api/v1/employees/export", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.text.splitlines()) == 3
+
+    @pytest.mark.parametrize("accept_encoding, compressed", [
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, deflate", False),
+        ("br, gzip;q=0.5", True),
+        ("GZIP", True),
+        ("*", True),
+        ("*;q=0", False),
+        ("gzip;q=0, *", False),
+        ("deflate", False),
+        ("identity", False),
+    ])
+    def test_export_honours_accept_encoding_quality(self, client, test_data, accept_encoding, compressed):
+        response = client.get("/api/v1/employees/export", headers={"Accept-Encoding": accept_encoding})
+        
+        assert response.status_code == 200
+        assert ("content-encoding" in response.headers) == compressed
+        assert len(response.text.splitlines()) == 3
+
+    def test_invalid_format(self, client, test_data):
+        response = client.get("/api/v1/employees/export?format=xml")
+        assert response.status_code == 422
+
+
+class TestAsyncListEmployeesEndpoint:
+    def test_list_employees(self, async_client, test_data):
+        data = async_client.get("/employees?statuses[]=ACTIVE&page_size=1").json()
+        
+        assert data["total"] == 2
+        assert len(data["data"]) == 1
+        assert data["data"][0]["company_name"] == "Company A"
+        assert data["next_cursor"]
+
+    def test_invalid_cursor(self, async_client, test_data):
+        response = async_client.get("/employees?cursor=garbage")
+        assert response.status_code == 400
+
+
+class TestParallelQueries:
+    @pytest.fixture(autouse=True)
+    def parallel_execution(self, monkeypatch):
+        monkeypatch.setattr(settings, "query_execution", "parallel")
+        monkeypatch.setattr(settings, "single_flight_enabled", False)
+
+    def test_sync_listing(self, client, test_data):
+        data = client.get("/api/v1/employees?statuses[]=ACTIVE&page_size=1").json()
+        
+        assert data["total"] == 2
+        assert len(data["data"]) == 1
+        assert data["next_cursor"]
+
+    def test_async_listing(self, async_client, test_data):
+        data = async_client.get("/employees?locations[]=Singapore").json()
+        
+        assert data["total"] == 2
+        assert {emp["last_name"] for emp in data["data"]} == {"Doe", "Johnson"}
+
+
+class TestRateLimiting:
+    @pytest.fixture(autouse=True)
+    def limited(self, client, monkeypatch):
+        app.dependency_overrides.pop(listing_rate_limit)
+        monkeypatch.setattr(rate_limit_deps, "rate_limiter", AsyncSlidingWindowRateLimiter())
+        monkeypatch.setattr(settings, "rate_limit", RateLimit(limit=6, window=30))
+        employee_statistics.invalidate()
+        yield
+        self.wait_for_statistics()
+        employee_statistics.invalidate()
+
+    def wait_for_statistics(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while employee_statistics.refresher.running and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_requests_over_the_limit_are_rejected(self, client, test_data):
+        statuses = [client.get("/api/v1/employees").status_code for _ in range(7)]
+        
+        assert statuses == [200] * 6 + [429]
+
+    def test_typeahead_has_its_own_limit(self, client, test_data, monkeypatch):
+        app.dependency_overrides.pop(rate_limit_dependency)
+        monkeypatch.setattr(settings, "rate_limit_routes", {"/api/v1/employees/typeahead": RateLimit(limit=2, window=30)})
+        typeahead_index.clear()
+        
+        statuses = [client.get("/api/v1/employees/typeahead?q=ja").status_code for _ in range(3)]
+        typeahead_index.clear()
+        
+        assert statuses == [200, 200, 429]
+        assert client.get("/api/v1/employees").status_code == 200
+
+    def test_expensive_requests_cost_more(self, client, test_data, monkeypatch):
+        monkeypatch.setattr(settings, "rate_limit_costs_enabled", True)
+        
+        # 1 + 4 for the search + 1 for 50 rows: the search uses the whole budget
+        assert client.get("/api/v1/employees?search=john&page_size=50").status_code == 200
+        assert client.get("/api/v1/employees").status_code == 429
+
+    @pytest.mark.parametrize("count_strategy", ["exact", "estimate"])
+    def test_matched_rows_are_charged_for_any_count_strategy(self, client, test_data, monkeypatch, count_strategy):
+        monkeypatch.setattr(settings, "rate_limit_costs_enabled", True)
+        monkeypatch.setattr(settings, "rate_limit_cost_matched_rows", 1)
+        monkeypatch.setattr(settings, "count_strategy", count_strategy)
+        
+        # Cold statistics are loaded in the background rather than on the request
+        assert client.get("/api/v1/employees?statuses[]=INACTIVE").status_code == 200
+        self.wait_for_statistics()
+        assert not employee_statistics.is_stale()
+        
+        # 1 + 3 matched rows
+        statuses = [client.get("/api/v1/employees?page_size=5").status_code for _ in range(2)]
+        assert statuses == [200, 429]
+
+    def test_cached_responses_cost_one(self, client, test_data, session, monkeypatch):
+        monkeypatch.setattr(settings, "rate_limit_costs_enabled", True)
+        monkeypatch.setattr(settings, "rate_limit_cost_matched_rows", 1)
+        monkeypatch.setattr(settings, "response_cache_enabled", True)
+        employee_statistics.load(session)
+        response_cache.clear()
+        
+        # 1 + 3 matched rows for the miss, then 1 per hit
+        statuses = [client.get("/api/v1/employees").status_code for _ in range(4)]
+        response_cache.clear()
+        
+        assert statuses == [200] * 3 + [429]
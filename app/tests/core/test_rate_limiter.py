@@ -0,0 +1,278 @@
+import asyncio
+import multiprocessing
+import socketserver
+import threading
+
+import pytest
+
+from app.api.deps.rate_limit_deps import resolve_rate_limit
+from app.core.async_rate_limiter import AsyncSlidingWindowRateLimiter
+from app.core.config import RateLimit, settings
+from app.core.redis_rate_limiter import RedisClient, RedisError, RedisRateLimiter
+from app.core.shared_memory_rate_limiter import SharedMemoryRateLimiter
+from app.core.sliding_window_rate_limiter import SlidingWindowRateLimiter
+from app.operations.cost import estimate_request_cost
+from app.schemas.employee import ListEmployeeFilters, SearchMode
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSlidingWindowRateLimiter:
+    def test_allows_up_to_limit(self):
+        limiter = SlidingWindowRateLimiter(clock=FakeClock())
+        
+        assert [limiter.rate_limit("a", limit=3, window=10) for _ in range(4)] == [True, True, True, False]
+        assert limiter.rate_limit("b", limit=3, window=10)
+
+    def test_previous_window_is_weighted(self):
+        clock = FakeClock()
+        limiter = SlidingWindowRateLimiter(clock=clock)
+        for _ in range(4):
+            assert limiter.rate_limit("a", limit=4, window=10)
+        
+        # Half of the previous window still overlaps: 4 * 0.5 = 2 used
+        clock.now += 15
+        assert limiter.rate_limit("a", limit=4, window=10)
+        assert limiter.rate_limit("a", limit=4, window=10)
+        assert not limiter.rate_limit("a", limit=4, window=10)
+
+    def test_rejected_requests_are_not_counted(self):
+        clock = FakeClock()
+        limiter = SlidingWindowRateLimiter(clock=clock)
+        for _ in range(10):
+            limiter.rate_limit("a", limit=2, window=10)
+        
+        clock.now += 20
+        assert limiter.rate_limit("a", limit=2, window=10)
+
+    def test_costly_requests_use_more_of_the_limit(self):
+        limiter = SlidingWindowRateLimiter(clock=FakeClock())
+        
+        assert limiter.rate_limit("a", limit=10, window=10, cost=6)
+        assert not limiter.rate_limit("a", limit=10, window=10, cost=6)
+        assert limiter.rate_limit("a", limit=10, window=10, cost=4)
+        assert not limiter.rate_limit("a", limit=10, window=10)
+
+    def test_idle_keys_are_evicted(self):
+        clock = FakeClock()
+        limiter = SlidingWindowRateLimiter(shards=4, clock=clock)
+        for client in range(100):
+            limiter.rate_limit(f"10.0.0.{client}", limit=5, window=10)
+        assert len(limiter) == 100
+        
+        clock.now += 15
+        limiter.rate_limit("10.0.0.1", limit=5, window=10)
+        assert limiter.evict_idle() == 0
+        
+        clock.now += 10
+        assert limiter.evict_idle() == 99
+        assert len(limiter) == 1
+
+
+class TestAsyncSlidingWindowRateLimiter:
+    def test_allows_up_to_limit_under_concurrency(self):
+        limiter = AsyncSlidingWindowRateLimiter(clock=FakeClock())
+        
+        async def main():
+            return await asyncio.gather(*(limiter.rate_limit("a", limit=10, window=10) for _ in range(50)))
+        
+        assert sum(asyncio.run(main())) == 10
+
+    def test_previous_window_is_weighted(self):
+        clock = FakeClock()
+        limiter = AsyncSlidingWindowRateLimiter(clock=clock)
+        
+        async def main():
+            for _ in range(4):
+                assert await limiter.rate_limit("a", limit=4, window=10)
+            clock.now += 15
+            return [await limiter.rate_limit("a", limit=4, window=10) for _ in range(3)]
+        
+        assert asyncio.run(main()) == [True, True, False]
+
+    def test_idle_keys_are_evicted_as_requests_arrive(self):
+        clock = FakeClock()
+        limiter = AsyncSlidingWindowRateLimiter(evict_batch=8, clock=clock)
+        
+        async def main():
+            for client in range(20):
+                await limiter.rate_limit(f"10.0.0.{client}", limit=5, window=10)
+            clock.now += 20
+            await limiter.rate_limit("10.0.0.100", limit=5, window=10)
+        
+        asyncio.run(main())
+        assert len(limiter) == 20 - 8 + 1
+        assert limiter.evictions == 8
+
+
+def _use_limiter(path, results):
+    limiter = SharedMemoryRateLimiter(path, slots=64, stripes=4)
+    results.put(sum(limiter.rate_limit("client", limit=10, window=60) for _ in range(10)))
+
+
+class TestSharedMemoryRateLimiter:
+    def test_limits_per_key(self, tmp_path):
+        limiter = SharedMemoryRateLimiter(str(tmp_path / "limits"), slots=64, stripes=4, clock=FakeClock())
+        
+        assert [limiter.rate_limit("a", limit=2, window=10) for _ in range(3)] == [True, True, False]
+        assert limiter.rate_limit("b", limit=2, window=10)
+
+    def test_state_is_shared_between_instances(self, tmp_path):
+        clock = FakeClock()
+        first = SharedMemoryRateLimiter(str(tmp_path / "limits"), slots=64, stripes=4, clock=clock)
+        second = SharedMemoryRateLimiter(str(tmp_path / "limits"), slots=64, stripes=4, clock=clock)
+        
+        assert first.rate_limit("a", limit=2, window=10)
+        assert second.rate_limit("a", limit=2, window=10)
+        assert not first.rate_limit("a", limit=2, window=10)
+        
+        clock.now += 20
+        assert second.rate_limit("a", limit=2, window=10)
+
+    def test_full_stripe_evicts_oldest(self, tmp_path):
+        clock = FakeClock()
+        limiter = SharedMemoryRateLimiter(str(tmp_path / "limits"), slots=4, stripes=1, clock=clock)
+        for client in range(4):
+            limiter.rate_limit(f"client-{client}", limit=1, window=10)
+            clock.now += 1
+        
+        assert limiter.rate_limit("newcomer", limit=1, window=10)
+        # client-0 lost its slot and starts over
+        assert limiter.rate_limit("client-0", limit=1, window=10)
+
+    def test_limit_holds_across_processes(self, tmp_path):
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        workers = [context.Process(target=_use_limiter, args=(str(tmp_path / "limits"), results)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        
+        assert sum(results.get() for _ in workers) == 10
+
+
+class _FakeRedisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        store = self.server.store
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2].decode())
+            command = args[0].upper()
+            
+            with self.server.lock:
+                if command in ("INCRBY", "DECRBY"):
+                    amount = int(args[2]) if command == "INCRBY" else -int(args[2])
+                    store[args[1]] = int(store.get(args[1], 0)) + amount
+                    reply = f":{store[args[1]]}\r\n"
+                elif command == "GET":
+                    value = store.get(args[1])
+                    reply = "$-1\r\n" if value is None else f"${len(str(value))}\r\n{value}\r\n"
+                elif command == "EXPIRE":
+                    reply = ":1\r\n"
+                else:
+                    reply = f"-ERR unknown command '{command}'\r\n"
+            self.wfile.write(reply.encode())
+
+
+@pytest.fixture
+def fake_redis():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _FakeRedisHandler)
+    server.daemon_threads = True
+    server.store = {}
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestRedisRateLimiter:
+    def test_limits_per_key(self, fake_redis):
+        host, port = fake_redis.server_address
+        limiter = RedisRateLimiter(RedisClient(f"redis://{host}:{port}/0"), clock=FakeClock())
+        
+        assert [limiter.rate_limit("a", limit=2, window=10) for _ in range(3)] == [True, True, False]
+        assert limiter.rate_limit("b", limit=2, window=10)
+        # The rejected request was taken back
+        assert fake_redis.store["rate_limit:a:10:100"] == 2
+
+    def test_costly_requests_use_more_of_the_limit(self, fake_redis):
+        host, port = fake_redis.server_address
+        limiter = RedisRateLimiter(RedisClient(f"redis://{host}:{port}/0"), clock=FakeClock())
+        
+        assert limiter.rate_limit("a", limit=10, window=10, cost=6)
+        assert not limiter.rate_limit("a", limit=10, window=10, cost=6)
+        assert fake_redis.store["rate_limit:a:10:100"] == 6
+
+    def test_previous_window_is_weighted(self, fake_redis):
+        clock = FakeClock()
+        host, port = fake_redis.server_address
+        limiter = RedisRateLimiter(RedisClient(f"redis://{host}:{port}/0"), clock=clock)
+        for _ in range(4):
+            assert limiter.rate_limit("a", limit=4, window=10)
+        
+        clock.now += 15
+        assert limiter.rate_limit("a", limit=4, window=10)
+        assert limiter.rate_limit("a", limit=4, window=10)
+        assert not limiter.rate_limit("a", limit=4, window=10)
+
+    def test_errors_fail_open(self, fake_redis):
+        host, port = fake_redis.server_address
+        client = RedisClient(f"redis://{host}:{port}/0")
+        
+        with pytest.raises(RedisError, match="unknown command"):
+            client.execute("FLUSHALL")
+        
+        fake_redis.shutdown()
+        fake_redis.server_close()
+        client.close()
+        limiter = RedisRateLimiter(client)
+        assert limiter.rate_limit("a", limit=1, window=10)
+        assert limiter.errors == 1
+
+
+class TestResolveRateLimit:
+    def test_overrides(self, monkeypatch):
+        monkeypatch.setattr(settings, "rate_limit", RateLimit(limit=5, window=30))
+        monkeypatch.setattr(settings, "rate_limit_routes", {"/api/v1/employees/export": RateLimit(limit=1, window=60)})
+        monkeypatch.setattr(settings, "rate_limit_keys", {"10.0.0.9": RateLimit(limit=100, window=30)})
+        
+        assert resolve_rate_limit("/api/v1/employees", "10.0.0.1") == ("10.0.0.1", RateLimit(limit=5, window=30))
+        assert resolve_rate_limit("/api/v1/employees/export", "10.0.0.1") == (
+            "/api/v1/employees/export:10.0.0.1", RateLimit(limit=1, window=60),
+        )
+        assert resolve_rate_limit("/api/v1/employees/export", "10.0.0.9") == (
+            "/api/v1/employees/export:10.0.0.9", RateLimit(limit=100, window=30),
+        )
+
+
+class TestEstimateRequestCost:
+    def test_disabled_by_default(self):
+        assert estimate_request_cost(ListEmployeeFilters(search="john", page=1_000, page_size=100)) == 1
+
+    def test_expensive_requests_cost_more(self, monkeypatch):
+        monkeypatch.setattr(settings, "rate_limit_costs_enabled", True)
+        
+        plain = estimate_request_cost(ListEmployeeFilters())
+        search = estimate_request_cost(ListEmployeeFilters(search="john"))
+        fuzzy = estimate_request_cost(ListEmployeeFilters(search="john", search_mode=SearchMode.FUZZY))
+        deep = estimate_request_cost(ListEmployeeFilters(page=1_000, page_size=100))
+        
+        assert plain == 1
+        assert plain < search < fuzzy
+        assert deep == 1 + 99 + 2
+        # A cursor seeks instead of skipping rows
+        assert estimate_request_cost(ListEmployeeFilters(page=1_000, page_size=100, cursor="c")) == 3
@@ -0,0 +1,43 @@
+from app.core.data_version import data_version
+from app.core.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(max_entries=2, ttl=60)
+        version = data_version.current
+        cache.set("a", b"a", version)
+        cache.set("b", b"b", version)
+        
+        assert cache.get("a") == b"a"
+        cache.set("c", b"c", version)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == b"a"
+        assert cache.get("c") == b"c"
+        assert cache.evictions == 1
+
+    def test_expired_entry_is_a_miss(self):
+        cache = ResponseCache(max_entries=2, ttl=0)
+        cache.set("a", b"a", data_version.current)
+        
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+
+    def test_version_bump_invalidates(self):
+        cache = ResponseCache(max_entries=2, ttl=60)
+        cache.set("a", b"a", data_version.current)
+        
+        data_version.bump()
+        
+        assert cache.get("a") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_stale_render_is_not_stored(self):
+        cache = ResponseCache(max_entries=2, ttl=60)
+        version = data_version.current
+        data_version.bump()
+        
+        cache.set("a", b"a", version)
+        
+        assert cache.get("a") is None
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.background_refresh import BackgroundRefresh
+from app.core.single_flight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def work():
+            calls.append(1)
+            release.wait(timeout=5)
+            return "result"
+
+        def request():
+            results.append(flight.do("key", work))
+
+        threads = [threading.Thread(target=request) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while flight.stats()["coalesced"] < 4 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert calls == [1]
+        assert results == ["result"] * 5
+        assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+    def test_sequential_calls_are_not_cached(self):
+        flight = SingleFlight()
+        values = iter([1, 2])
+
+        assert flight.do("key", lambda: next(values)) == 1
+        assert flight.do("key", lambda: next(values)) == 2
+
+    def test_different_keys_run_separately(self):
+        flight = SingleFlight()
+
+        assert flight.do("a", lambda: "a") == "a"
+        assert flight.do("b", lambda: "b") == "b"
+        assert flight.stats()["executions"] == 2
+
+    def test_exception_is_raised_and_cleared(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            flight.do("key", fail)
+        assert flight.do("key", lambda: "ok") == "ok"
+
+
+class TestAsyncSingleFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def main():
+            return await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+        assert asyncio.run(main()) == ["result"] * 5
+        assert calls == [1]
+        assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+    def test_exception_reaches_every_caller(self):
+        flight = AsyncSingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def main():
+            return await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(main())
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.stats()["in_flight"] == 0
+
+
+class TestBackgroundRefresh:
+    def test_one_reload_at_a_time(self):
+        refresh = BackgroundRefresh("test-refresh")
+        release = threading.Event()
+        done = threading.Event()
+        calls = []
+
+        def reload():
+            calls.append(1)
+            release.wait(timeout=5)
+            done.set()
+
+        assert refresh.start(reload)
+        assert not refresh.start(reload)
+        release.set()
+        done.wait(timeout=5)
+        deadline = time.monotonic() + 5
+        while refresh.running and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        assert calls == [1]
+        assert not refresh.running
+
+    @pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+    def test_failed_reload_can_be_retried(self):
+        refresh = BackgroundRefresh("test-refresh")
+        failed = threading.Event()
+
+        def reload():
+            failed.set()
+            raise RuntimeError("database unavailable")
+
+        refresh.start(reload)
+        failed.wait(timeout=5)
+        deadline = time.monotonic() + 5
+        while refresh.running and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        assert refresh.start(lambda: None)
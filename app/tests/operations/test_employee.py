@@ -1,13 +1,29 @@
+import base64
+import json
+import threading
+import time
+
 import pytest
 from sqlmodel import Session, create_engine, SQLModel
-from sqlalchemy import event
+from sqlalchemy import event, text
 
-from app.operations.employee import get_employees
+from app.core.config import settings
+from app.core.filter_index import FilterIndex, filter_index
+from app.core.organisation_settings import OrganisationConfig, organisation_settings_store
+from app.core.table_versions import table_versions
+from app.core.trigram_index import trigram_index
+from app.core.typeahead_index import typeahead_index
+from app.operations.counting import count_cache, employee_statistics
+from app.operations.cursor import InvalidCursorError, decode_cursor
+from app.operations.employee import get_employee_page, get_employees
+from app.operations.facets import get_facets
 from app.models.employee import Employee, EmployeeStatus
 from app.models.company import Company
 from app.models.department import Department
 from app.models.organisation import Organisation
-from app.schemas.employee import ListEmployeeFilters
+from app.models.organisation_settings import OrganisationSettings
+from app.schemas.employee import ListEmployeeFilters, SearchMode, SortOrder
+from app.schemas.pagination import CountStrategy
 
 
 @pytest.fixture(scope="function")
@@ -166,7 +182,7 @@ class TestGetEmployees:
         total, employees = get_employees(session, filters)
         
         assert total == 5
-        assert len(employees) == 4
+        assert len(employees) == 5
     
     def test_pagination_first_page(self, session, test_employees):
         filters = ListEmployeeFilters(page=1, page_size=2)
@@ -301,3 +317,762 @@ class TestGetEmployees:
         assert total == 0
         assert len(employees) == 0
 
+
+class TestDenormalizedNames:
+    def test_names_are_filled_on_insert(self, session, test_employees):
+        total, employees = get_employees(session, ListEmployeeFilters(search="john.doe"))
+        
+        assert employees[0].company_name == "Company A"
+        assert employees[0].department_name == "Engineering"
+
+    def test_employee_without_department_is_listed(self, session, test_employees):
+        total, employees = get_employees(session, ListEmployeeFilters(search="charlie"))
+        
+        assert total == 1
+        assert len(employees) == 1
+        assert employees[0].company_name == "Company C"
+        assert employees[0].department_name is None
+
+    def test_renames_propagate(self, session, test_employees, test_companies, test_departments):
+        test_companies[0].name = "Company A Renamed"
+        test_departments[0].name = "Platform"
+        session.add_all([test_companies[0], test_departments[0]])
+        session.commit()
+        
+        total, employees = get_employees(session, ListEmployeeFilters(search="john.doe"))
+        assert employees[0].company_name == "Company A Renamed"
+        assert employees[0].department_name == "Platform"
+
+    def test_moving_employee_updates_names(self, session, test_employees, test_companies, test_departments):
+        employee = test_employees[0]
+        employee.company_id = test_companies[1].id
+        employee.department_id = test_departments[2].id
+        session.add(employee)
+        session.commit()
+        
+        total, employees = get_employees(session, ListEmployeeFilters(search="john.doe"))
+        assert employees[0].company_name == "Company B"
+        assert employees[0].department_name == "Sales"
+
+
+class TestDisplayColumns:
+    @pytest.fixture(autouse=True)
+    def clear_settings_store(self):
+        organisation_settings_store.clear()
+        yield
+        organisation_settings_store.clear()
+
+    @pytest.fixture
+    def display_settings(self, session, test_organisation):
+        org_settings = OrganisationSettings(
+            organisation_id=test_organisation.id,
+            settings={"employee_display_columns": ["position", "company_name"]},
+        )
+        session.add(org_settings)
+        session.commit()
+        return org_settings
+
+    def test_selects_identity_and_display_columns(self, session, test_employees, test_organisation, display_settings):
+        filters = ListEmployeeFilters(organisation_id=test_organisation.id)
+        total, employees = get_employees(session, filters)
+        
+        assert total == 5
+        assert set(employees[0]._fields) == {
+            "id", "first_name", "last_name", "email", "status", "company_name", "position",
+        }
+
+    def test_organisation_without_settings_lists_all_columns(self, session, test_employees, test_organisation):
+        total, employees = get_employees(session, ListEmployeeFilters(organisation_id=test_organisation.id))
+        
+        assert total == 5
+        assert "location" in employees[0]._fields
+        assert "department_name" in employees[0]._fields
+
+    def test_filters_by_organisation(self, session, test_employees, display_settings):
+        other = Organisation(name="Other Organisation")
+        session.add(other)
+        session.commit()
+        
+        total, employees = get_employees(session, ListEmployeeFilters(organisation_id=other.id))
+        assert total == 0
+        assert employees == []
+
+    def test_writes_from_other_processes_are_picked_up(
+        self, session, test_employees, test_organisation, display_settings, monkeypatch,
+    ):
+        monkeypatch.setattr(table_versions, "interval", 60)
+        filters = ListEmployeeFilters(organisation_id=test_organisation.id)
+        get_employees(session, filters)
+        
+        # As another worker or a task would: no ORM event reaches this process
+        session.connection().execute(
+            text("UPDATE organisationsettings SET settings = :settings"),
+            {"settings": '{"employee_display_columns": ["location"]}'},
+        )
+        session.commit()
+        
+        # Until the counter is re-read the loaded settings are served
+        total, employees = get_employees(session, filters)
+        assert "position" in employees[0]._fields
+        
+        monkeypatch.setattr(table_versions, "interval", 0)
+        total, employees = get_employees(session, filters)
+        assert "location" in employees[0]._fields
+        assert "position" not in employees[0]._fields
+
+    def test_changes_refresh_only_that_organisation(self, session, test_employees, test_organisation, display_settings):
+        filters = ListEmployeeFilters(organisation_id=test_organisation.id)
+        get_employees(session, filters)
+        
+        display_settings.settings = {"employee_display_columns": ["location"]}
+        session.add(display_settings)
+        session.commit()
+        assert organisation_settings_store.changed == {test_organisation.id}
+        
+        total, employees = get_employees(session, filters)
+        assert "location" in employees[0]._fields
+        assert "position" not in employees[0]._fields
+        assert organisation_settings_store.changed == set()
+
+    def test_deleted_settings_show_every_column(self, session, test_employees, test_organisation, display_settings):
+        filters = ListEmployeeFilters(organisation_id=test_organisation.id)
+        get_employees(session, filters)
+        
+        session.delete(display_settings)
+        session.commit()
+        
+        assert organisation_settings_store.get(session, test_organisation.id) == OrganisationConfig()
+        total, employees = get_employees(session, filters)
+        assert "location" in employees[0]._fields
+
+    def test_rolled_back_changes_are_ignored(self, session, test_organisation, display_settings):
+        organisation_settings_store.load(session)
+        
+        display_settings.settings = {"employee_display_columns": ["location"]}
+        session.add(display_settings)
+        session.flush()
+        session.rollback()
+        
+        assert organisation_settings_store.changed == set()
+        assert organisation_settings_store.display_columns(session, test_organisation.id) == (
+            "position", "company_name",
+        )
+
+
+class TestFullTextSearch:
+    @pytest.fixture(autouse=True)
+    def fts_backend(self, monkeypatch):
+        monkeypatch.setattr(settings, "search_backend", "fts")
+
+    def test_search_by_prefix(self, session, test_employees):
+        filters = ListEmployeeFilters(page=1, page_size=10, search="joh")
+        total, employees = get_employees(session, filters)
+        
+        assert total == 2
+        names = [f"{emp.first_name} {emp.last_name}" for emp in employees]
+        assert "John Doe" in names
+        assert "Bob Johnson" in names
+
+    def test_search_multiple_tokens(self, session, test_employees):
+        filters = ListEmployeeFilters(page=1, page_size=10, search="jane smi")
+        total, employees = get_employees(session, filters)
+        
+        assert total == 1
+        assert employees[0].email == "jane.smith@test.com"
+
+    def test_search_by_email(self, session, test_employees):
+        filters = ListEmployeeFilters(page=1, page_size=10, search="bob.johnson@test")
+        total, employees = get_employees(session, filters)
+        
+        assert total == 1
+        assert employees[0].first_name == "Bob"
+
+    def test_index_follows_updates_and_deletes(self, session, test_employees):
+        employee = test_employees[0]
+        employee.first_name = "Jonathan"
+        session.add(employee)
+        session.delete(test_employees[2])
+        session.commit()
+
+        total, employees = get_employees(session, ListEmployeeFilters(search="jonathan"))
+        assert total == 1
+        
+        total, employees = get_employees(session, ListEmployeeFilters(search="bob"))
+        assert total == 0
+
+    def test_search_without_tokens_falls_back_to_like(self, session, test_employees):
+        filters = ListEmployeeFilters(page=1, page_size=10, search="@")
+        total, employees = get_employees(session, filters)
+        
+        assert total == 5
+
+
+class TestFuzzySearch:
+    @pytest.fixture(autouse=True)
+    def fresh_vocabulary(self):
+        trigram_index.invalidate()
+        yield
+        trigram_index.invalidate()
+
+    def search(self, session, search, **kwargs):
+        filters = ListEmployeeFilters(search=search, search_mode=SearchMode.FUZZY, **kwargs)
+        return get_employee_page(session, filters)
+
+    def test_misspelled_names_match(self, session, test_employees):
+        page = self.search(session, "Jonh Doe")
+        
+        assert page.total == 1
+        assert page.employees[0].email == "john.doe@test.com"
+
+    def test_standard_search_finds_nothing(self, session, test_employees):
+        total, employees = get_employees(session, ListEmployeeFilters(search="Jane Smtih"))
+        assert total == 0
+
+    def test_names_written_elsewhere_join_after_ttl(self, session, test_employees, monkeypatch):
+        assert self.search(session, "Maximillian").total == 0
+        
+        # As set_up_data or another worker would: no ORM event reaches this process
+        session.connection().exec_driver_sql(
+            f"UPDATE employee SET first_name = 'Maximilian' WHERE id = {test_employees[0].id}"
+        )
+        monkeypatch.setattr(table_versions, "interval", 0)
+        monkeypatch.setattr(trigram_index, "ttl", 0)
+        
+        assert self.search(session, "Maximillian").total == 1
+        
+        page = self.search(session, "Jane Smtih")
+        assert [employee.last_name for employee in page.employees] == ["Smith"]
+
+    def test_closest_match_ranks_first(self, session, test_employees, test_organisation, test_companies):
+        session.add(Employee(
+            first_name="Jon", last_name="Snow", email="jon.snow@test.com",
+            status=EmployeeStatus.ACTIVE, company_id=test_companies[0].id,
+            organisation_id=test_organisation.id,
+        ))
+        session.commit()
+        
+        page = self.search(session, "john")
+        assert page.employees[0].first_name == "John"
+        assert {employee.first_name for employee in page.employees[1:]} == {"Jon", "Bob"}
+
+    def test_filters_still_apply(self, session, test_employees):
+        page = self.search(session, "Jonh", statuses=[EmployeeStatus.INACTIVE])
+        
+        assert [employee.first_name for employee in page.employees] == ["Bob"]
+
+    def test_cursor_walks_ranked_results(self, session, test_employees):
+        first = self.search(session, "jo", page_size=1)
+        second = self.search(session, "jo", page_size=1, cursor=first.next_cursor)
+        
+        by_offset = self.search(session, "jo", page_size=2)
+        assert [*first.employees, *second.employees] == by_offset.employees
+
+    def test_facets_use_fuzzy_matches(self, session, test_employees):
+        facets = get_facets(session, ListEmployeeFilters(search="Jane Smtih", search_mode=SearchMode.FUZZY))
+        
+        assert [(facet.value, facet.count) for facet in facets.statuses] == [("ACTIVE", 1)]
+
+
+class TestSortOrder:
+    def walk(self, session, **kwargs):
+        seen = []
+        cursor = None
+        while True:
+            page = get_employee_page(session, ListEmployeeFilters(page_size=2, cursor=cursor, **kwargs))
+            seen.extend(page.employees)
+            cursor = page.next_cursor
+            if cursor is None:
+                return seen
+
+    def test_sort_by_last_name(self, session, test_employees):
+        total, employees = get_employees(session, ListEmployeeFilters(sort=SortOrder.LAST_NAME))
+        assert [employee.last_name for employee in employees] == ["Brown", "Doe", "Johnson", "Smith", "Williams"]
+
+    def test_name_sort_ties_break_on_id(self, session, test_employees, test_organisation, test_companies):
+        session.add(Employee(
+            first_name="Jane", last_name="Austen", email="jane.austen@test.com",
+            status=EmployeeStatus.ACTIVE, company_id=test_companies[0].id,
+            organisation_id=test_organisation.id,
+        ))
+        session.commit()
+        
+        employees = self.walk(session, sort=SortOrder.FIRST_NAME)
+        assert [(employee.first_name, employee.last_name) for employee in employees] == [
+            ("Alice", "Williams"), ("Bob", "Johnson"), ("Charlie", "Brown"),
+            ("Jane", "Smith"), ("Jane", "Austen"), ("John", "Doe"),
+        ]
+
+    def test_cursor_walk_matches_offset_pages(self, session, test_employees):
+        total, employees = get_employees(session, ListEmployeeFilters(sort=SortOrder.LAST_NAME))
+        assert self.walk(session, sort=SortOrder.LAST_NAME) == employees
+
+    def test_relevance_ranks_exact_then_prefix_then_substring(self, session, test_employees, test_organisation, test_companies):
+        session.add_all([
+            Employee(
+                first_name="Jo", last_name="March", email="jo.march@test.com",
+                status=EmployeeStatus.ACTIVE, company_id=test_companies[0].id,
+                organisation_id=test_organisation.id,
+            ),
+            Employee(
+                first_name="Nojo", last_name="Exact", email="nojo@test.com",
+                status=EmployeeStatus.ACTIVE, company_id=test_companies[0].id,
+                organisation_id=test_organisation.id,
+            ),
+        ])
+        session.commit()
+        
+        # Relevance is the default order of a search
+        total, employees = get_employees(session, ListEmployeeFilters(search="jo"))
+        assert [employee.first_name for employee in employees] == ["Jo", "John", "Bob", "Nojo"]
+        
+        walked = self.walk(session, search="jo")
+        assert walked == employees
+
+    def test_explicit_sort_overrides_relevance(self, session, test_employees):
+        total, employees = get_employees(session, ListEmployeeFilters(search="jo", sort=SortOrder.ID))
+        assert [employee.first_name for employee in employees] == ["John", "Bob"]
+
+    def test_cursor_from_other_sort_is_rejected(self, session, test_employees):
+        page = get_employee_page(session, ListEmployeeFilters(page_size=1, sort=SortOrder.LAST_NAME))
+        
+        with pytest.raises(InvalidCursorError):
+            get_employee_page(session, ListEmployeeFilters(page_size=1, cursor=page.next_cursor))
+
+
+class TestCursorPagination:
+    def test_walk_all_pages_with_cursor(self, session, test_employees):
+        filters = ListEmployeeFilters(page_size=2)
+        seen = []
+        
+        while True:
+            page = get_employee_page(session, filters)
+            seen.extend(emp.id for emp in page.employees)
+            if page.next_cursor is None:
+                break
+            filters = ListEmployeeFilters(page_size=2, cursor=page.next_cursor)
+        
+        assert len(seen) == 5
+        assert seen == sorted(seen)
+
+    def test_cursor_matches_offset_pages(self, session, test_employees):
+        first = get_employee_page(session, ListEmployeeFilters(page=1, page_size=2))
+        by_offset = get_employee_page(session, ListEmployeeFilters(page=2, page_size=2))
+        by_cursor = get_employee_page(
+            session, ListEmployeeFilters(page_size=2, cursor=first.next_cursor)
+        )
+        
+        assert [emp.id for emp in by_cursor.employees] == [emp.id for emp in by_offset.employees]
+        assert by_cursor.total == by_offset.total == 5
+
+    @pytest.mark.parametrize("statuses", [[], [EmployeeStatus.INACTIVE, EmployeeStatus.ACTIVE]])
+    def test_pages_merged_over_companies_stay_in_id_order(self, session, test_employees, test_companies, statuses):
+        company_ids = [test_companies[1].id, test_companies[0].id]
+        expected = sorted(
+            emp.id for emp in test_employees
+            if emp.company_id in company_ids and (not statuses or emp.status in statuses)
+        )
+        filters = ListEmployeeFilters(page_size=2, company_ids=company_ids, statuses=statuses)
+        seen = []
+
+        while True:
+            page = get_employee_page(session, filters)
+            seen.extend(emp.id for emp in page.employees)
+            if page.next_cursor is None:
+                break
+            filters = filters.model_copy(update={"cursor": page.next_cursor})
+
+        by_offset = get_employee_page(
+            session, ListEmployeeFilters(page=2, page_size=2, company_ids=company_ids, statuses=statuses)
+        )
+
+        assert len(expected) > 2
+        assert seen == expected
+        assert [emp.id for emp in by_offset.employees] == expected[2:4]
+        assert by_offset.total == len(expected)
+
+    def test_last_page_has_no_next_cursor(self, session, test_employees):
+        page = get_employee_page(session, ListEmployeeFilters(page=1, page_size=10))
+        
+        assert page.next_cursor is None
+
+    def test_invalid_cursor(self, session, test_employees):
+        with pytest.raises(InvalidCursorError):
+            get_employee_page(session, ListEmployeeFilters(cursor="not-a-cursor"))
+
+    @pytest.mark.parametrize("payload, sort", [
+        (["last_name", {"a": 1}, 1], SortOrder.LAST_NAME),
+        (["last_name", ["Doe"], 1], SortOrder.LAST_NAME),
+        (["last_name", 5, 1], SortOrder.LAST_NAME),
+        (["id", 1, True], SortOrder.ID),
+        (["id", True, 1], SortOrder.ID),
+        (["id", 1, 2 ** 70], SortOrder.ID),
+        (["id", 2 ** 70, 1], SortOrder.ID),
+        (["id", "1", 1], SortOrder.ID),
+        (["relevance", "high", 1], SortOrder.RELEVANCE),
+        (["relevance", float("nan"), 1], SortOrder.RELEVANCE),
+        (["unknown", 1, 1], SortOrder.ID),
+    ])
+    def test_tampered_cursor_is_rejected(self, session, test_employees, payload, sort):
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+        
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+        with pytest.raises(InvalidCursorError):
+            get_employee_page(session, ListEmployeeFilters(cursor=cursor, sort=sort, search="o"))
+
+    @pytest.mark.parametrize("payload", [
+        ["id", 3, 3],
+        ["last_name", "Doe", 1],
+        ["relevance", 2, 1],
+        ["relevance", 1.5, 1],
+    ])
+    def test_well_formed_cursor_is_accepted(self, payload):
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+        
+        assert list(decode_cursor(cursor)) == payload
+
+
+class TestCountStrategies:
+    @pytest.fixture(autouse=True)
+    def reset_count_state(self):
+        count_cache.clear()
+        employee_statistics.invalidate()
+        yield
+        count_cache.clear()
+        employee_statistics.invalidate()
+
+    def test_cached_count_is_reused_across_pages(self, session, test_employees):
+        filters = ListEmployeeFilters(page=1, page_size=2, count_strategy=CountStrategy.CACHED)
+        assert get_employee_page(session, filters).total == 5
+        
+        # Remove a row behind the ORM's back: the cached total is still served
+        session.connection().exec_driver_sql(
+            f"DELETE FROM employee WHERE id = {test_employees[0].id}"
+        )
+        filters = ListEmployeeFilters(page=2, page_size=2, count_strategy=CountStrategy.CACHED)
+        assert get_employee_page(session, filters).total == 5
+
+    def test_cached_count_invalidated_on_write(self, session, test_employees):
+        filters = ListEmployeeFilters(statuses=[EmployeeStatus.ACTIVE], count_strategy=CountStrategy.CACHED)
+        assert get_employee_page(session, filters).total == 3
+        
+        test_employees[2].status = EmployeeStatus.ACTIVE
+        session.add(test_employees[2])
+        session.commit()
+        
+        assert get_employee_page(session, filters).total == 4
+
+    def test_estimate_single_dimension_is_exact(self, session, test_employees):
+        filters = ListEmployeeFilters(locations=["Singapore"], count_strategy=CountStrategy.ESTIMATE)
+        page = get_employee_page(session, filters)
+        
+        assert page.total == 3
+        assert page.total_is_estimate is True
+
+    def test_estimate_combines_dimensions(self, session, test_employees):
+        filters = ListEmployeeFilters(
+            statuses=[EmployeeStatus.ACTIVE],
+            locations=["Singapore"],
+            count_strategy=CountStrategy.ESTIMATE,
+        )
+        page = get_employee_page(session, filters)
+        
+        # 5 * (3/5) * (3/5)
+        assert page.total == 2
+        assert page.total_is_estimate is True
+
+    def test_stale_statistics_are_served_while_refreshed(self, session, test_employees, monkeypatch):
+        refreshes = []
+        monkeypatch.setattr(employee_statistics, "refresh_in_background", lambda engine: refreshes.append(engine))
+        filters = ListEmployeeFilters(locations=["Singapore"], count_strategy=CountStrategy.ESTIMATE)
+        assert get_employee_page(session, filters).total == 3
+        
+        session.delete(test_employees[0])
+        session.commit()
+        monkeypatch.setattr(employee_statistics, "ttl", 0)
+        
+        # The request answers from the last snapshot instead of rescanning the table
+        assert get_employee_page(session, filters).total == 3
+        assert refreshes == [session.get_bind()]
+
+    def test_concurrent_cold_estimates_load_once(self, session, test_employees, monkeypatch):
+        loads = []
+        
+        def slow_load(session):
+            # Stands in for the scans; SQLite connections can't cross threads here
+            loads.append(session)
+            time.sleep(0.05)
+            employee_statistics.counts = {name: {} for name in employee_statistics.DIMENSIONS}
+            employee_statistics.loaded_at = time.monotonic()
+        
+        monkeypatch.setattr(employee_statistics, "load", slow_load)
+        filters = ListEmployeeFilters(count_strategy=CountStrategy.ESTIMATE)
+        threads = [
+            threading.Thread(target=employee_statistics.estimate, args=(session, filters))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(loads) == 1
+
+    def test_estimate_with_search_is_exact(self, session, test_employees):
+        filters = ListEmployeeFilters(search="john", count_strategy=CountStrategy.ESTIMATE)
+        page = get_employee_page(session, filters)
+        
+        assert page.total == 2
+        assert page.total_is_estimate is False
+
+    def test_filter_key_ignores_order_and_paging(self):
+        a = ListEmployeeFilters(page=1, locations=["Singapore", "Jakarta"], company_ids=[2, 1])
+        b = ListEmployeeFilters(page=3, locations=["Jakarta", "Singapore"], company_ids=[1, 2])
+        
+        assert a.filter_key() == b.filter_key()
+
+
+class TestFacets:
+    def _counts(self, facet_values):
+        return {facet.value: facet.count for facet in facet_values}
+
+    def test_unfiltered_facets(self, session, test_employees, test_companies):
+        facets = get_facets(session, ListEmployeeFilters())
+        
+        assert self._counts(facets.statuses) == {"ACTIVE": 3, "INACTIVE": 1, "TERMINATED": 1}
+        assert self._counts(facets.locations) == {"Singapore": 3, "Kuala Lumpur": 1, "Jakarta": 1}
+        assert self._counts(facets.company_ids) == {
+            test_companies[0].id: 3, test_companies[1].id: 1, test_companies[2].id: 1
+        }
+        assert facets.company_ids[0].label == "Company A"
+        assert self._counts(facets.department_ids)[None] == 1
+
+    def test_dimension_ignores_its_own_filter(self, session, test_employees):
+        filters = ListEmployeeFilters(statuses=[EmployeeStatus.ACTIVE], locations=["Singapore"])
+        facets = get_facets(session, filters)
+        
+        # statuses are counted within Singapore, locations within ACTIVE
+        assert self._counts(facets.statuses) == {"ACTIVE": 2, "INACTIVE": 1}
+        assert self._counts(facets.locations) == {"Singapore": 2, "Kuala Lumpur": 1}
+
+    def test_aggregate_follows_writes(self, session, test_employees):
+        test_employees[0].location = "Jakarta"
+        session.add(test_employees[0])
+        session.delete(test_employees[1])
+        session.commit()
+        
+        facets = get_facets(session, ListEmployeeFilters())
+        assert self._counts(facets.locations) == {"Singapore": 2, "Jakarta": 2}
+
+    def test_search_uses_live_counts(self, session, test_employees):
+        facets = get_facets(session, ListEmployeeFilters(search="john"))
+        
+        assert self._counts(facets.statuses) == {"ACTIVE": 1, "INACTIVE": 1}
+
+
+class TestFilterIndex:
+    @pytest.fixture()
+    def loaded_index(self, session, test_employees, monkeypatch):
+        monkeypatch.setattr(settings, "filter_index_enabled", True)
+        monkeypatch.setattr(FilterIndex, "refresh_in_background", lambda self: None)
+        monkeypatch.setattr(table_versions, "interval", 0)
+        filter_index.load(session)
+        yield filter_index
+        filter_index.version = None
+
+    def test_filters_match_sql(self, session, loaded_index, test_companies):
+        filters = ListEmployeeFilters(
+            statuses=[EmployeeStatus.ACTIVE, EmployeeStatus.TERMINATED],
+            company_ids=[test_companies[0].id, test_companies[2].id],
+            locations=["Singapore", "Jakarta"],
+        )
+        result = loaded_index.search(filters)
+        
+        assert result.total == 3
+        assert result.ids == sorted(result.ids)
+        
+        page = get_employee_page(session, filters)
+        assert page.total == 3
+        assert all(emp.id in result.ids for emp in page.employees)
+
+    def test_unknown_value_matches_nothing(self, loaded_index):
+        result = loaded_index.search(ListEmployeeFilters(locations=["Nowhere"]))
+        
+        assert result.total == 0
+        assert result.ids == []
+
+    def test_pages_by_offset_and_cursor(self, session, loaded_index):
+        first = get_employee_page(session, ListEmployeeFilters(page=1, page_size=2))
+        second = get_employee_page(session, ListEmployeeFilters(page=2, page_size=2))
+        by_cursor = get_employee_page(session, ListEmployeeFilters(page_size=2, cursor=first.next_cursor))
+        
+        assert first.total == 5
+        assert [emp.id for emp in second.employees] == [emp.id for emp in by_cursor.employees]
+
+    def test_stale_index_falls_back_to_sql(self, session, loaded_index, test_employees):
+        test_employees[2].status = EmployeeStatus.ACTIVE
+        session.add(test_employees[2])
+        session.commit()
+        
+        assert not loaded_index.is_current(session)
+        total, _ = get_employees(session, ListEmployeeFilters(statuses=[EmployeeStatus.ACTIVE]))
+        assert total == 4
+
+    def test_other_writes_keep_index_current(self, session, loaded_index, test_organisation):
+        session.add(OrganisationSettings(organisation_id=test_organisation.id, settings={}))
+        session.commit()
+        
+        assert loaded_index.is_current(session)
+
+    def test_writes_from_outside_the_orm_make_index_stale(self, session, loaded_index, test_employees):
+        # As another worker or a task would: no ORM event reaches this process
+        session.connection().exec_driver_sql(
+            f"UPDATE employee SET status = 'ACTIVE' WHERE id = {test_employees[2].id}"
+        )
+        
+        assert not loaded_index.is_current(session)
+        total, _ = get_employees(session, ListEmployeeFilters(statuses=[EmployeeStatus.ACTIVE]))
+        assert total == 4
+
+    def test_load_between_flush_and_commit_is_stale(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(FilterIndex, "refresh_in_background", lambda self: None)
+        # A file database, so the second session reads through its own connection
+        engine = create_engine(f"sqlite:///{tmp_path / 'employees.db'}")
+        SQLModel.metadata.create_all(engine)
+        index = FilterIndex()
+        
+        with Session(engine) as writer, Session(engine) as reader:
+            organisation = Organisation(name="Test Organisation")
+            writer.add(organisation)
+            writer.flush()
+            company = Company(name="Company A", organisation_id=organisation.id)
+            writer.add(company)
+            writer.flush()
+            writer.add(Employee(
+                first_name="John", last_name="Doe", email="john.doe@test.com",
+                status=EmployeeStatus.ACTIVE, company_id=company.id, organisation_id=organisation.id,
+            ))
+            writer.flush()
+            
+            # Loaded from the committed rows only, while the write is pending
+            index.load(reader)
+            reader.commit()
+            assert index.search(ListEmployeeFilters()).total == 0
+            
+            writer.commit()
+            assert not index.is_current(reader)
+        
+        engine.dispose()
+
+    def test_name_sort_is_served_from_sql(self, session, loaded_index):
+        total, employees = get_employees(session, ListEmployeeFilters(
+            statuses=[EmployeeStatus.ACTIVE], sort=SortOrder.LAST_NAME,
+        ))
+        
+        assert total == 3
+        assert [emp.last_name for emp in employees] == ["Brown", "Doe", "Smith"]
+
+
+class TestTypeaheadIndex:
+    @pytest.fixture(autouse=True)
+    def clear_index(self, monkeypatch):
+        # Writes below come through the ORM; only the test for other processes re-reads the counter
+        monkeypatch.setattr(table_versions, "interval", 60)
+        typeahead_index.clear()
+        yield
+        typeahead_index.clear()
+
+    def names(self, session, prefix, limit=10):
+        return [
+            f"{suggestion.first_name} {suggestion.last_name}"
+            for suggestion in typeahead_index.suggest(session, prefix, limit)
+        ]
+
+    def test_prefix_matches_names_and_emails(self, session, test_employees):
+        # Ordered by matched key: an exact name comes before longer completions
+        assert self.names(session, "jo") == ["John Doe", "Bob Johnson"]
+        assert self.names(session, "Ch") == ["Charlie Brown"]
+        assert self.names(session, "john d") == ["John Doe"]
+        assert self.names(session, "alice.w") == ["Alice Williams"]
+        assert self.names(session, "zz") == []
+        assert self.names(session, "  ") == []
+
+    def test_employee_listed_once_and_limited(self, session, test_employees):
+        assert self.names(session, "j") == ["Jane Smith", "John Doe", "Bob Johnson"]
+        assert self.names(session, "j", limit=1) == ["Jane Smith"]
+
+    def test_follows_writes_incrementally(self, session, test_employees, test_organisation, test_companies):
+        assert self.names(session, "john") == ["John Doe", "Bob Johnson"]
+        
+        test_employees[0].first_name = "Jonathan"
+        session.add(test_employees[0])
+        session.delete(test_employees[2])
+        session.add(Employee(
+            first_name="Johanna", last_name="Lee", email="johanna.lee@test.com",
+            status=EmployeeStatus.ACTIVE, company_id=test_companies[0].id,
+            organisation_id=test_organisation.id,
+        ))
+        session.commit()
+        assert len(typeahead_index.changed) == 3
+        
+        assert self.names(session, "jo") == ["Johanna Lee", "Jonathan Doe"]
+        assert self.names(session, "john") == ["Jonathan Doe"]
+        assert typeahead_index.changed == set()
+
+    def test_writes_from_other_processes_trigger_a_rebuild(self, session, test_employees, monkeypatch):
+        rebuilds = []
+        monkeypatch.setattr(typeahead_index, "refresh_in_background", lambda: rebuilds.append(True))
+        assert self.names(session, "jo") == ["John Doe", "Bob Johnson"]
+        
+        # As set_up_data or another worker would: no ORM event reaches this process
+        session.connection().exec_driver_sql(
+            f"UPDATE employee SET first_name = 'Joanna' WHERE id = {test_employees[1].id}"
+        )
+        monkeypatch.setattr(table_versions, "interval", 0)
+        
+        assert self.names(session, "jo") == ["John Doe", "Bob Johnson"]
+        assert rebuilds == [True]
+        
+        # What the background rebuild runs
+        typeahead_index.load(session)
+        assert self.names(session, "jo") == ["Joanna Smith", "John Doe", "Bob Johnson"]
+        assert rebuilds == [True]
+
+    def test_concurrent_cold_lookups_load_once(self, session, test_employees, monkeypatch):
+        loads = []
+        
+        def slow_load(session):
+            # Stands in for a long load; SQLite connections can't cross threads here
+            loads.append(session)
+            time.sleep(0.05)
+            typeahead_index.loaded = True
+        
+        monkeypatch.setattr(typeahead_index, "load", slow_load)
+        threads = [threading.Thread(target=typeahead_index.ensure_loaded, args=(session,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(loads) == 1
+        assert typeahead_index.loaded
+
+    def test_large_delta_is_rebuilt(self, session, test_employees, monkeypatch):
+        rebuilds = []
+        monkeypatch.setattr(typeahead_index, "max_delta", 1)
+        monkeypatch.setattr(typeahead_index, "refresh_in_background", lambda: rebuilds.append(True))
+        assert self.names(session, "jo") == ["John Doe", "Bob Johnson"]
+        
+        test_employees[0].first_name = "Jonathan"
+        session.add(test_employees[0])
+        session.delete(test_employees[2])
+        session.commit()
+        
+        assert self.names(session, "jo") == ["Jonathan Doe"]
+        assert rebuilds == [True]
+        assert len(typeahead_index.delta) == 2
+        
+        # What the background rebuild runs: the delta is folded into the arrays
+        typeahead_index.load(session)
+        assert typeahead_index.delta == {}
+        assert self.names(session, "jo") == ["Jonathan Doe"]
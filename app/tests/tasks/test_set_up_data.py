@@ -0,0 +1,76 @@
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from app.models.company import Company
+from app.models.department import Department
+from app.models.organisation import Organisation
+from app.models.organisation_settings import OrganisationSettings
+from app.tasks.set_up_data import (
+    create_companies,
+    create_departments,
+    create_organisation_settings,
+    create_organisations,
+    load_json_data,
+)
+
+
+@pytest.fixture(scope="function")
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'set_up_data.db'}", echo=False)
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        yield session
+
+    engine.dispose()
+
+
+def load_reference_data(session):
+    org_map = create_organisations(session)
+    company_map = create_companies(session, org_map)
+    departments = create_departments(session, org_map, company_map)
+    create_organisation_settings(session, org_map)
+    return org_map, company_map, departments
+
+
+def row_counts(session):
+    return {
+        model.__name__: session.exec(select(func.count()).select_from(model)).one()
+        for model in (Organisation, Company, Department, OrganisationSettings)
+    }
+
+
+class TestReferenceData:
+    def test_loads_every_natural_key_once(self, session):
+        load_reference_data(session)
+
+        assert row_counts(session) == {
+            "Organisation": len({row["name"] for row in load_json_data("organisation_data.json")}),
+            "Company": len({
+                (row["organisation_name"], row["name"]) for row in load_json_data("company_data.json")
+            }),
+            "Department": len({
+                (row["company_name"], row["name"]) for row in load_json_data("department_data.json")
+            }),
+            "OrganisationSettings": len({
+                row["organisation_name"] for row in load_json_data("organisation_settings_data.json")
+            }),
+        }
+
+    def test_second_run_inserts_nothing_and_returns_the_same_rows(self, session):
+        org_map, company_map, departments = load_reference_data(session)
+        counts = row_counts(session)
+
+        second_org_map, second_company_map, second_departments = load_reference_data(session)
+
+        assert row_counts(session) == counts
+        assert {name: org.id for name, org in second_org_map.items()} == {
+            name: org.id for name, org in org_map.items()
+        }
+        assert {name: company.id for name, company in second_company_map.items()} == {
+            name: company.id for name, company in company_map.items()
+        }
+        assert sorted(department.id for department in second_departments) == sorted(
+            department.id for department in departments
+        )
+        assert len(departments) == counts["Department"]